@@ -1,5 +1,28 @@
 import sqlite3  # Importa el módulo sqlite3 para trabajar con bases de datos SQLite.
 
+# Columnas de 'datos' que forman un Contact, en el orden de sus campos.
+CONTACT_COLUMNS = "ID, NOMBRE, EDAD, CORREO, TELEFONO, CI"
+
+# Registro de un contacto. Con __slots__ cada instancia guarda solo sus campos, sin diccionario
+# propio, y se leen por nombre (contact.ci) en lugar de por posición (x[5]).
+class Contact:
+    __slots__ = ("id", "name", "age", "email", "phone", "ci")
+
+    def __init__(self, id, name, age, email, phone, ci):
+        self.id = id
+        self.name = name
+        self.age = age
+        self.email = email
+        self.phone = phone
+        self.ci = ci
+
+    def __repr__(self):
+        return f"Contact(id={self.id!r}, name={self.name!r}, ci={self.ci!r})"
+
+# Fábrica de filas de sqlite3: convierte cada fila de CONTACT_COLUMNS en un Contact.
+def contact_factory(cursor, row):
+    return Contact(*row)
+
 # Clase que maneja las operaciones CRUD para contactos.
 class ContactManager:
     def __init__(self):
@@ -16,7 +39,8 @@ class ContactManager:
     def get_contacts(self):
         # Método para obtener todos los contactos de la base de datos.
         cursor = self.connection.cursor()  # Crea un cursor para ejecutar consultas.
-        query = "SELECT * FROM datos"  # Consulta SQL para seleccionar todos los contactos.
+        cursor.row_factory = contact_factory  # Cada fila se lee como un Contact.
+        query = f"SELECT {CONTACT_COLUMNS} FROM datos"  # Consulta SQL para seleccionar todos los contactos.
         cursor.execute(query)  # Ejecuta la consulta.
         contacts = cursor.fetchall()  # Obtiene todos los resultados de la consulta.
         return contacts  # Devuelve la lista de contactos.
@@ -194,11 +194,11 @@ class FormUi(ft.UserControl):
                 ft.DataRow(
                     on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
                     cells=[
-                        ft.DataCell(ft.Text(x[1])),  # Nombre.
-                        ft.DataCell(ft.Text(str(x[2]))),  # Edad.
-                        ft.DataCell(ft.Text(str(x[5]))),  # Ci
-                        ft.DataCell(ft.Text(x[3])),  # Correo.
-                        ft.DataCell(ft.Text(str(x[4]))),  # Teléfono.
+                        ft.DataCell(ft.Text(x.name)),  # Nombre.
+                        ft.DataCell(ft.Text(str(x.age))),  # Edad.
+                        ft.DataCell(ft.Text(str(x.ci))),  # Ci
+                        ft.DataCell(ft.Text(x.email)),  # Correo.
+                        ft.DataCell(ft.Text(str(x.phone))),  # Teléfono.
                     ]
                 )
             )
@@ -231,7 +231,7 @@ class FormUi(ft.UserControl):
         # Comprobar si el contacto ya existe.
         contact_exists = False
         for row in self.data.get_contacts():
-            if row[1] == name:
+            if row.name == name:
                 contact_exists = True
                 break
 
@@ -266,7 +266,7 @@ class FormUi(ft.UserControl):
             e.control.selected = True
         name = e.control.cells[0].content.value  # Obtiene el nombre de la fila seleccionada.
         for row in self.data.get_contacts():
-            if row[1] == name:
+            if row.name == name:
                 self.selected_row = row  # Guarda la fila seleccionada.
                 break
         self.update()
@@ -274,13 +274,13 @@ class FormUi(ft.UserControl):
     def edit_field_text(self, e):  
         try: 
             # Rellena los campos con los datos de la fila seleccionada.
-            self.name.value = self.selected_row[1]
-            self.age.value = self.selected_row[2]
-            self.ci.value = self.selected_row[5]
-            self.email.value = self.selected_row[3]
-            self.phone.value = self.selected_row[4]   
+            self.name.value = self.selected_row.name
+            self.age.value = self.selected_row.age
+            self.ci.value = self.selected_row.ci
+            self.email.value = self.selected_row.email
+            self.phone.value = self.selected_row.phone   
             self.update()
-        except TypeError:
+        except AttributeError:
             print("Error")  # Manejo de error si no se seleccionó ninguna fila.
 
 # ACTUALIZAR DATOS
@@ -298,7 +298,7 @@ class FormUi(ft.UserControl):
         # Verifica que los campos no estén vacíos.
         if len(name) > 0 and len(age) > 0 and len(ci) > 0 and len(email) > 0 and len(phone) > 0:
             self.clean_fields()  # Limpia los campos tras actualizar.
-            self.data.update_contact(self.selected_row[0], name, age, ci, email, phone)  # Actualiza el contacto.
+            self.data.update_contact(self.selected_row.id, name, age, ci, email, phone)  # Actualiza el contacto.
             self.show_data()  # Muestra los datos actualizados.
 
 # BORRAR DATOS
@@ -307,13 +307,13 @@ class FormUi(ft.UserControl):
             self.show_error_modal("No ha seleccionado ningún registro.")  # Error si no hay fila seleccionada.
             return
 
-        self.data.delete_contact(self.selected_row[1])  # Elimina el contacto seleccionado.
+        self.data.delete_contact(self.selected_row.name)  # Elimina el contacto seleccionado.
         self.show_data()  # Muestra los datos actualizados.
 
 # BÚSQUEDA
     def search_data(self, e):  
         search = self.search_field.value.lower()  # Obtiene el término de búsqueda.
-        name = list(filter(lambda x: search in x[1].lower(), self.data.get_contacts()))  # Filtra contactos.
+        name = list(filter(lambda x: search in x.name.lower(), self.data.get_contacts()))  # Filtra contactos.
         self.data_table.rows = []  # Limpia la tabla.
         if not self.search_field.value == "": 
             if len(name) > 0:
@@ -322,11 +322,11 @@ class FormUi(ft.UserControl):
                         ft.DataRow(
                             on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
                             cells=[
-                                ft.DataCell(ft.Text(x[1])),  # Nombre.
-                                ft.DataCell(ft.Text(str(x[2]))),  # Edad.
-                                ft.DataCell(ft.Text(str(x[5]))),  # CI.
-                                ft.DataCell(ft.Text(x[3])),  # Correo.
-                                ft.DataCell(ft.Text(str(x[4]))),  # Teléfono.
+                                ft.DataCell(ft.Text(x.name)),  # Nombre.
+                                ft.DataCell(ft.Text(str(x.age))),  # Edad.
+                                ft.DataCell(ft.Text(str(x.ci))),  # CI.
+                                ft.DataCell(ft.Text(x.email)),  # Correo.
+                                ft.DataCell(ft.Text(str(x.phone))),  # Teléfono.
                             ]
                         )
                     )
@@ -349,7 +349,8 @@ class FormUi(ft.UserControl):
         pdf.add_page()  # Añade una página al PDF.
         column_widths = [10, 40, 20, 40, 80, 40]  # Define el ancho de las columnas.
         # Agrega filas a la tabla.
-        data = self.data.get_contacts()  # Obtiene todos los contactos.
+        # Obtiene todos los contactos, con los campos en el mismo orden que el encabezado.
+        data = [(c.id, c.name, c.age, c.email, c.phone, c.ci) for c in self.data.get_contacts()]
         header = ("ID", "NOMBRE", "EDAD", "CORREO", "TELÉFONO", "CÉDULA")  # Define el encabezado.
         data.insert(0, header)  # Inserta el encabezado en los datos.
         for row in data:  # Añade cada fila al PDF.
@@ -365,7 +366,7 @@ class FormUi(ft.UserControl):
         file_name = datetime.datetime.now()  # Crea un nombre de archivo basado en la fecha y hora.
         file_name = file_name.strftime("DATA %Y-%m-%d_%H-%M-%S") + ".xlsx"  # Formato del nombre.
         contacts = self.data.get_contacts()  # Obtiene todos los contactos.
-        df = pd.DataFrame(contacts, columns=["ID", "Nombre", "Edad", "Correo", "Teléfono", "Cédula"])  # Crea un DataFrame.
+        df = pd.DataFrame([(c.id, c.name, c.age, c.email, c.phone, c.ci) for c in contacts], columns=["ID", "Nombre", "Edad", "Correo", "Teléfono", "Cédula"])  # Crea un DataFrame.
         df.to_excel(file_name, index=False)  # Guarda el DataFrame como archivo Excel.
 
     def build(self):
@@ -1,25 +1,95 @@
+import re  # Importa el módulo de expresiones regulares para normalizar teléfonos.
 import sqlite3  # Importa el módulo sqlite3 para trabajar con bases de datos SQLite.
 
+NON_DIGITS = re.compile(r'\D')  # Todo lo que no es dígito.
+# Columnas de 'datos' que forman un Contact, en el orden de sus campos.
+CONTACT_COLUMNS = "ID, NOMBRE, EDAD, CORREO, TELEFONO, CI, TELEFONO_DIGITOS"
+
+# Registro de un contacto. Con __slots__ cada instancia guarda solo sus campos, sin diccionario
+# propio, y se leen por nombre (contact.ci) en lugar de por posición (x[5]).
+class Contact:
+    __slots__ = ("id", "name", "age", "email", "phone", "ci", "phone_digits")
+
+    def __init__(self, id, name, age, email, phone, ci, phone_digits):
+        self.id = id
+        self.name = name
+        self.age = age
+        self.email = email
+        self.phone = phone  # Teléfono con formato para mostrar.
+        self.ci = ci
+        self.phone_digits = phone_digits  # Teléfono solo con dígitos.
+
+    def __repr__(self):
+        return f"Contact(id={self.id!r}, name={self.name!r}, ci={self.ci!r})"
+
+# Fábrica de filas de sqlite3: convierte cada fila de CONTACT_COLUMNS en un Contact.
+def contact_factory(cursor, row):
+    return Contact(*row)
+
+# Función que normaliza un teléfono una sola vez, al guardarlo.
+# Devuelve (solo dígitos, formato para mostrar); el formato es (xxxx)xxx-xxx si tiene 10 dígitos.
+def normalize_phone(phone):
+    phone = str(phone)
+    digits = NON_DIGITS.sub('', phone)  # Solo dígitos
+    if len(digits) == 10:
+        return digits, f"({digits[:4]}){digits[4:7]}-{digits[7:]}"
+    return digits, phone  # Si no tiene 10 dígitos, se muestra como está
+
 # Clase que maneja las operaciones CRUD para contactos.
 class ContactManager:
     def __init__(self):
         # Inicializa la conexión a la base de datos 'data.db'.
         self.connection = sqlite3.connect("data.db", check_same_thread=False)
+        self.migrate_phones()  # Asegura la columna de teléfono normalizado y su índice.
+
+    def migrate_phones(self):
+        # Método que agrega la columna TELEFONO_DIGITOS (solo dígitos) y guarda en TELEFONO el formato para mostrar.
+        # ALTER TABLE se confirma por su cuenta, así que la conversión de los contactos existentes no depende
+        # de él: en cada arranque se completan las filas que aún no tienen TELEFONO_DIGITOS (por ejemplo, si
+        # el programa se cerró a mitad de la migración). Con el índice esa búsqueda no recorre la tabla.
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(datos)")]
+        if "TELEFONO_DIGITOS" not in columns:
+            self.connection.execute("ALTER TABLE datos ADD COLUMN TELEFONO_DIGITOS TEXT")
+        # Índice para buscar por teléfono sin recorrer la tabla.
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_datos_telefono ON datos (TELEFONO_DIGITOS)")
+        rows = self.connection.execute(
+            "SELECT ID, TELEFONO FROM datos WHERE TELEFONO_DIGITOS IS NULL AND TELEFONO IS NOT NULL").fetchall()
+        self.connection.executemany(
+            "UPDATE datos SET TELEFONO_DIGITOS = ?, TELEFONO = ? WHERE ID = ?",
+            [(*normalize_phone(phone), contact_id) for contact_id, phone in rows])
+        self.connection.commit()  # Confirma los cambios en la base de datos.
+
+    def contacts(self, query, params=()):
+        # Método que ejecuta una consulta sobre CONTACT_COLUMNS y devuelve Contact.
+        cursor = self.connection.cursor()
+        cursor.row_factory = contact_factory
+        return cursor.execute(query, params).fetchall()
 
     def add_contact(self, name, age, ci, email, phone):
         # Método para agregar un nuevo contacto a la base de datos.
-        query = '''INSERT INTO datos (NOMBRE, EDAD, CI, CORREO, TELEFONO) 
-                   VALUES (?, ?, ?, ?, ?)'''  # Consulta SQL para insertar un contacto.
-        self.connection.execute(query, (name, age, ci, email, phone))  # Ejecuta la consulta con los datos proporcionados.
+        digits, display = normalize_phone(phone)  # Normaliza el teléfono al guardarlo.
+        query = '''INSERT INTO datos (NOMBRE, EDAD, CI, CORREO, TELEFONO, TELEFONO_DIGITOS) 
+                   VALUES (?, ?, ?, ?, ?, ?)'''  # Consulta SQL para insertar un contacto.
+        self.connection.execute(query, (name, age, ci, email, display, digits))  # Ejecuta la consulta con los datos proporcionados.
         self.connection.commit()  # Confirma los cambios en la base de datos.
 
     def get_contacts(self):
         # Método para obtener todos los contactos de la base de datos.
-        cursor = self.connection.cursor()  # Crea un cursor para ejecutar consultas.
-        query = "SELECT * FROM datos"  # Consulta SQL para seleccionar todos los contactos.
-        cursor.execute(query)  # Ejecuta la consulta.
-        contacts = cursor.fetchall()  # Obtiene todos los resultados de la consulta.
-        return contacts  # Devuelve la lista de contactos.
+        query = f"SELECT {CONTACT_COLUMNS} FROM datos"  # Consulta SQL para seleccionar todos los contactos.
+        return self.contacts(query)  # Devuelve la lista de contactos.
+
+    def get_contacts_by_phone(self, phone):
+        # Método para obtener los contactos con un teléfono exacto (usa idx_datos_telefono).
+        digits, display = normalize_phone(phone)
+        query = f"SELECT {CONTACT_COLUMNS} FROM datos WHERE TELEFONO_DIGITOS = ?"  # Búsqueda exacta en el índice.
+        return self.contacts(query, (digits,))
+
+    def search_by_phone(self, prefix):
+        # Método para obtener los contactos cuyo teléfono empieza por 'prefix'.
+        # Se busca como rango [prefix, prefix + ':'), que SQLite resuelve recorriendo solo esa parte del índice.
+        digits, display = normalize_phone(prefix)
+        query = f"SELECT {CONTACT_COLUMNS} FROM datos WHERE TELEFONO_DIGITOS >= ? AND TELEFONO_DIGITOS < ? ORDER BY TELEFONO_DIGITOS"
+        return self.contacts(query, (digits, digits + ':'))  # ':' va justo después de '9'.
 
     def delete_contact(self, name):
         # Método para eliminar un contacto basado en su nombre.
@@ -29,9 +99,10 @@ class ContactManager:
 
     def update_contact(self, contact_id, name, age, ci, email, phone):
         # Método para actualizar un contacto existente en la base de datos.
-        query = '''UPDATE datos SET NOMBRE = ?, EDAD = ?, CI = ?, CORREO = ?, TELEFONO = ?
+        digits, display = normalize_phone(phone)  # Normaliza el teléfono al guardarlo.
+        query = '''UPDATE datos SET NOMBRE = ?, EDAD = ?, CI = ?, CORREO = ?, TELEFONO = ?, TELEFONO_DIGITOS = ?
                    WHERE ID = ?'''  # Consulta SQL para actualizar un contacto.
-        self.connection.execute(query, (name, age, ci, email, phone, contact_id))  # Ejecuta la consulta con los nuevos datos.
+        self.connection.execute(query, (name, age, ci, email, display, digits, contact_id))  # Ejecuta la consulta con los nuevos datos.
         self.connection.commit()  # Confirma los cambios en la base de datos.
 
     def close_connection(self):
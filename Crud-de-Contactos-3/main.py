@@ -5,14 +5,6 @@ from fpdf import FPDF  # Importa FPDF para la generación de PDFs.
 import pandas as pd  # Importa pandas para la manipulación de datos.
 import datetime  # Importa datetime para manejar fechas y horas.
 
-# Función para formatear teléfono en (xxxx)xxx-xxx
-def format_phone(phone_str):
-    digits = re.sub(r'\D', '', phone_str)  # Solo dígitos
-    if len(digits) == 10:
-        return f"({digits[:4]}){digits[4:7]}-{digits[7:]}"
-    else:
-        return phone_str  # Si no tiene 10 dígitos, retorna como está
-
 # Clase que define el encabezado y pie de página de un PDF.
 class PDF(FPDF):
     def header(self):
@@ -45,10 +37,10 @@ class FormUi(ft.UserControl):
                                   input_filter=ft.NumbersOnlyInputFilter(),
                                   max_length=10)
 
-        # Campo de búsqueda para encontrar contactos por nombre.
+        # Campo de búsqueda para encontrar contactos por nombre o teléfono.
         self.search_field = ft.TextField(  
                             suffix_icon=ft.icons.SEARCH,
-                            label="Buscar por el nombre",
+                            label="Buscar por nombre o teléfono",
                             border=ft.InputBorder.UNDERLINE,
                             border_color="white",
                             label_style=ft.TextStyle(color="white"),
@@ -202,11 +194,11 @@ class FormUi(ft.UserControl):
                 ft.DataRow(
                     on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
                     cells=[
-                        ft.DataCell(ft.Text(x[1])),  # Nombre.
-                        ft.DataCell(ft.Text(str(x[2]))),  # Edad.
-                        ft.DataCell(ft.Text(str(x[5]))),  # Ci
-                        ft.DataCell(ft.Text(x[3])),  # Correo.
-                        ft.DataCell(ft.Text(format_phone(str(x[4])))),  # Teléfono formateado.
+                        ft.DataCell(ft.Text(x.name)),  # Nombre.
+                        ft.DataCell(ft.Text(str(x.age))),  # Edad.
+                        ft.DataCell(ft.Text(str(x.ci))),  # Ci
+                        ft.DataCell(ft.Text(x.email)),  # Correo.
+                        ft.DataCell(ft.Text(x.phone)),  # Teléfono (ya guardado con formato).
                     ]
                 )
             )
@@ -239,7 +231,7 @@ class FormUi(ft.UserControl):
         # Comprobar si el contacto ya existe.
         contact_exists = False
         for row in self.data.get_contacts():
-            if row[1] == name:
+            if row.name == name:
                 contact_exists = True
                 break
 
@@ -274,7 +266,7 @@ class FormUi(ft.UserControl):
             e.control.selected = True
         name = e.control.cells[0].content.value  # Obtiene el nombre de la fila seleccionada.
         for row in self.data.get_contacts():
-            if row[1] == name:
+            if row.name == name:
                 self.selected_row = row  # Guarda la fila seleccionada.
                 break
         self.update()
@@ -282,14 +274,14 @@ class FormUi(ft.UserControl):
     def edit_field_text(self, e):  
         try: 
             # Rellena los campos con los datos de la fila seleccionada.
-            self.name.value = self.selected_row[1]
-            self.age.value = self.selected_row[2]
-            self.ci.value = self.selected_row[5]
-            self.email.value = self.selected_row[3]
+            self.name.value = self.selected_row.name
+            self.age.value = self.selected_row.age
+            self.ci.value = self.selected_row.ci
+            self.email.value = self.selected_row.email
             # El teléfono se muestra sin formato para editar más fácil
-            self.phone.value = self.selected_row[4]   
+            self.phone.value = self.selected_row.phone_digits
             self.update()
-        except TypeError:
+        except AttributeError:
             print("Error")  # Manejo de error si no se seleccionó ninguna fila.
 
 # ACTUALIZAR DATOS
@@ -307,7 +299,7 @@ class FormUi(ft.UserControl):
         # Verifica que los campos no estén vacíos.
         if len(name) > 0 and len(age) > 0 and len(ci) > 0 and len(email) > 0 and len(phone) > 0:
             self.clean_fields()  # Limpia los campos tras actualizar.
-            self.data.update_contact(self.selected_row[0], name, age, ci, email, phone)  # Actualiza el contacto.
+            self.data.update_contact(self.selected_row.id, name, age, ci, email, phone)  # Actualiza el contacto.
             self.show_data()  # Muestra los datos actualizados.
 
 # BORRAR DATOS
@@ -316,13 +308,16 @@ class FormUi(ft.UserControl):
             self.show_error_modal("No ha seleccionado ningún registro.")  # Error si no hay fila seleccionada.
             return
 
-        self.data.delete_contact(self.selected_row[1])  # Elimina el contacto seleccionado.
+        self.data.delete_contact(self.selected_row.name)  # Elimina el contacto seleccionado.
         self.show_data()  # Muestra los datos actualizados.
 
 # BÚSQUEDA
     def search_data(self, e):  
         search = self.search_field.value.lower()  # Obtiene el término de búsqueda.
-        name = list(filter(lambda x: search in x[1].lower(), self.data.get_contacts()))  # Filtra contactos.
+        if search.isdigit():
+            name = self.data.search_by_phone(search)  # Solo dígitos: busca por teléfono en el índice.
+        else:
+            name = list(filter(lambda x: search in x.name.lower(), self.data.get_contacts()))  # Filtra contactos.
         self.data_table.rows = []  # Limpia la tabla.
         if not self.search_field.value == "": 
             if len(name) > 0:
@@ -331,11 +326,11 @@ class FormUi(ft.UserControl):
                         ft.DataRow(
                             on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
                             cells=[
-                                ft.DataCell(ft.Text(x[1])),  # Nombre.
-                                ft.DataCell(ft.Text(str(x[2]))),  # Edad.
-                                ft.DataCell(ft.Text(str(x[5]))),  # CI.
-                                ft.DataCell(ft.Text(x[3])),  # Correo.
-                                ft.DataCell(ft.Text(format_phone(str(x[4])))),  # Teléfono formateado.
+                                ft.DataCell(ft.Text(x.name)),  # Nombre.
+                                ft.DataCell(ft.Text(str(x.age))),  # Edad.
+                                ft.DataCell(ft.Text(str(x.ci))),  # CI.
+                                ft.DataCell(ft.Text(x.email)),  # Correo.
+                                ft.DataCell(ft.Text(x.phone)),  # Teléfono (ya guardado con formato).
                             ]
                         )
                     )
@@ -356,17 +351,13 @@ class FormUi(ft.UserControl):
     def save_pdf(self, e):
         pdf = PDF()  # Crea una nueva instancia de PDF.
         pdf.add_page()  # Añade una página al PDF.
-        column_widths = [10, 40, 20, 40, 80, 40]  # Define el ancho de las columnas.
-        # Agrega filas a la tabla.
-        data = self.data.get_contacts()  # Obtiene todos los contactos.
+        column_widths = [10, 40, 20, 80, 40, 40]  # Define el ancho de las columnas.
+        # Agrega filas a la tabla, con los campos en el mismo orden que el encabezado.
+        data = [(c.id, c.name, c.age, c.email, c.phone, c.ci) for c in self.data.get_contacts()]
         header = ("ID", "NOMBRE", "EDAD", "CORREO", "TELÉFONO", "CÉDULA")  # Define el encabezado.
         data.insert(0, header)  # Inserta el encabezado en los datos.
         for row in data:  # Añade cada fila al PDF.
-            row_items = list(row)
-            if row != header:
-                # Formatear teléfono en PDF
-                row_items[4] = format_phone(str(row_items[4]))
-            for item, width in zip(row_items, column_widths):
+            for item, width in zip(row, column_widths):  # El teléfono ya viene formateado.
                 pdf.cell(width, 10, str(item), border=1)  # Escribe cada celda.
             pdf.ln()  # Salto de línea para la siguiente fila.
         file_name = datetime.datetime.now()  # Crea un nombre de archivo basado en la fecha y hora.
@@ -378,13 +369,8 @@ class FormUi(ft.UserControl):
         file_name = datetime.datetime.now()  # Crea un nombre de archivo basado en la fecha y hora.
         file_name = file_name.strftime("DATA %Y-%m-%d_%H-%M-%S") + ".xlsx"  # Formato del nombre.
         contacts = self.data.get_contacts()  # Obtiene todos los contactos.
-        # Formatear teléfonos para Excel
-        contacts_formatted = []
-        for c in contacts:
-            c_list = list(c)
-            c_list[4] = format_phone(str(c_list[4]))
-            contacts_formatted.append(c_list)
-        df = pd.DataFrame(contacts_formatted, columns=["ID", "Nombre", "Edad", "Correo", "Teléfono", "Cédula"])  # Crea un DataFrame.
+        # El teléfono ya viene formateado; se omite la columna de solo dígitos.
+        df = pd.DataFrame([(c.id, c.name, c.age, c.email, c.phone, c.ci) for c in contacts], columns=["ID", "Nombre", "Edad", "Correo", "Teléfono", "Cédula"])  # Crea un DataFrame.
         df.to_excel(file_name, index=False)  # Guarda el DataFrame como archivo Excel.
 
     def build(self):
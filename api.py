@@ -0,0 +1,265 @@
+import argparse  # Importa argparse para leer los argumentos de la línea de comandos.
+import json  # Importa json para las peticiones y respuestas.
+import secrets  # Importa secrets para identificar cada arranque del servicio en las ETag.
+from concurrent.futures import Future  # Importa Future para esperar las escrituras en cola.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Servidor HTTP de la biblioteca estándar.
+from urllib.parse import parse_qs, urlsplit  # Importa las funciones para leer la ruta y los parámetros.
+from contact_manager import ContactManager  # Importa el manejador de contactos (no depende de Flet).
+from validation import validate_contact  # Importa las mismas validaciones que el formulario y la importación.
+
+# Campos de un contacto en JSON, en el orden de las columnas de la tabla 'datos'.
+FIELDS = ("id", "nombre", "edad", "correo", "telefono")
+# Campo de JSON -> atributo de Contact.
+ATTRIBUTES = {"id": "id", "nombre": "name", "edad": "age", "correo": "email", "telefono": "phone"}
+# Campo de JSON -> columna por la que list_contacts puede ordenar.
+SORT_FIELDS = {"id": "ID", "nombre": "NOMBRE", "edad": "EDAD", "correo": "CORREO", "telefono": "TELEFONO"}
+MAX_LIMIT = 500  # Máximo de contactos por página.
+
+# Error que se responde al cliente con su código HTTP.
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# Función que convierte un Contact (o una tupla con sus campos en orden) en un diccionario para JSON.
+def contact_to_json(contact):
+    return None if contact is None else dict(zip(FIELDS, contact))
+
+# Función que espera una escritura en cola (modo group_commit) o devuelve el resultado directo.
+def resolve(result):
+    return result.result() if isinstance(result, Future) else result
+
+# Función que valida el cuerpo de un contacto y devuelve (nombre, edad, correo, teléfono).
+def read_contact(body):
+    if not isinstance(body, dict):
+        raise ApiError(400, "Se esperaba un objeto JSON.")
+    contact, error = validate_contact(*(body.get(field) for field in FIELDS[1:]))
+    if error:
+        raise ApiError(400, error)
+    return contact
+
+# Función que lee un parámetro entero de la URL.
+def int_param(params, name, default):
+    try:
+        return int(params.get(name, [default])[0])
+    except ValueError:
+        raise ApiError(400, f"'{name}' debe ser un número entero.")
+
+# Clase que atiende cada petición; el servidor guarda el manejador de contactos y la identidad del arranque.
+class ContactHandler(BaseHTTPRequestHandler):
+    server_version = "ContactosAPI/1.0"
+
+    # RESPUESTAS
+    def send_json(self, status, payload, etag=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # El cliente debe revalidar con If-None-Match.
+        self.end_headers()
+        self.wfile.write(body)
+
+    def current_etag(self):
+        # La ETag cambia con cualquier commit en la base de datos (de este servicio, de la interfaz o de otro proceso).
+        return f'"{self.server.instance}-{self.server.manager.change_version()}"'
+
+    def not_modified(self, etag):
+        # Devuelve True (y responde 304) si el cliente ya tiene esta versión de los datos.
+        requested = self.headers.get("If-None-Match")
+        if requested is None:
+            return False
+        if requested.strip() != "*" and etag not in [tag.strip() for tag in requested.split(",")]:
+            return False
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        return True
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            raise ApiError(400, "El cuerpo no es JSON válido.")
+
+    def dispatch(self, method):
+        # Busca la ruta, ejecuta la operación y convierte los errores en respuestas JSON.
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = parse_qs(url.query)
+        try:
+            if not parts or parts[0] != "contacts":
+                if parts == ["stats"] and method == "GET":
+                    return self.send_json(200, self.server.manager.query_stats())
+                if parts == ["changes"] and method == "GET":
+                    return self.list_changes(params)
+                raise ApiError(404, "Ruta no encontrada.")
+            if len(parts) == 1:
+                handler = {"GET": self.list_contacts, "POST": self.create_contact}.get(method)
+                args = (params,) if method == "GET" else ()
+            elif parts[1] == "search":
+                handler = {"GET": self.search_contacts}.get(method)
+                args = (params,)
+            elif parts[1] == "batch":
+                handler = {"POST": self.batch}.get(method)
+                args = ()
+            elif parts[1].isdigit() and len(parts) == 2:
+                handler = {"GET": self.get_contact, "PUT": self.update_contact,
+                           "DELETE": self.delete_contact}.get(method)
+                args = (int(parts[1]),)
+            else:
+                raise ApiError(404, "Ruta no encontrada.")
+            if handler is None:
+                raise ApiError(405, "Método no permitido.")
+            handler(*args)
+        except ApiError as error:
+            self.send_json(error.status, {"error": str(error)})
+        except Exception as error:
+            self.log_error("%s %s: %r", method, self.path, error)
+            self.send_json(500, {"error": "Error interno."})
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    # LECTURAS (con ETag: si nada cambió se responde 304 sin consultar la tabla)
+    def list_contacts(self, params):
+        etag = self.current_etag()
+        if self.not_modified(etag):
+            return
+        field = params.get("order_by", ["id"])[0]
+        if field not in SORT_FIELDS:
+            raise ApiError(400, f"No se puede ordenar por '{field}'.")
+        order_by = SORT_FIELDS[field]
+        limit = max(1, min(int_param(params, "limit", 50), MAX_LIMIT))
+        after_id = int_param(params, "after_id", 0)
+        after_value = params.get("after_value", [None])[0]
+        if order_by == "EDAD" and after_value is not None:
+            after_value = int_param(params, "after_value", 0)
+        descending = params.get("desc", ["0"])[0] in ("1", "true")
+        # Pide una fila extra para saber si hay una página siguiente.
+        rows = self.server.manager.list_contacts(after_id, limit + 1, order_by, descending, after_value)
+        following = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            following = {"after_id": last.id, "after_value": None if order_by == "ID" else getattr(last, ATTRIBUTES[field])}
+        self.send_json(200, {"contacts": [contact_to_json(row) for row in rows[:limit]], "next": following}, etag)
+
+    def search_contacts(self, params):
+        etag = self.current_etag()
+        if self.not_modified(etag):
+            return
+        query = params.get("q", [""])[0]
+        limit = max(1, min(int_param(params, "limit", 50), MAX_LIMIT))
+        rows = self.server.manager.search(query, limit)
+        self.send_json(200, {"contacts": [contact_to_json(row) for row in rows]}, etag)
+
+    def list_changes(self, params):
+        # Cambios posteriores a 'since'; el cliente sigue desde 'last_seq'.
+        etag = self.current_etag()
+        if self.not_modified(etag):
+            return
+        since = int_param(params, "since", 0)
+        limit = max(1, min(int_param(params, "limit", 1000), 10 * MAX_LIMIT))
+        rows = self.server.manager.changes_since(since, limit)
+        changes = [{"seq": change.seq, "id": change.id, "operation": change.operation,
+                    "contact": contact_to_json(change.contact)}
+                   for change in rows]
+        self.send_json(200, {"changes": changes, "last_seq": rows[-1].seq if rows else since}, etag)
+
+    def get_contact(self, contact_id):
+        etag = self.current_etag()
+        if self.not_modified(etag):
+            return
+        row = self.server.manager.get_contact_by_id(contact_id)
+        if row is None:
+            raise ApiError(404, "El contacto no existe.")
+        self.send_json(200, contact_to_json(row), etag)
+
+    # ESCRITURAS
+    def create_contact(self):
+        contact = read_contact(self.read_body())
+        row = resolve(self.server.manager.add_contact(*contact))
+        self.send_json(201, contact_to_json(row))
+
+    def update_contact(self, contact_id):
+        contact = read_contact(self.read_body())
+        row = resolve(self.server.manager.update_contact(contact_id, *contact))
+        if row is None:
+            raise ApiError(404, "El contacto no existe.")
+        self.send_json(200, contact_to_json(row))
+
+    def delete_contact(self, contact_id):
+        deleted = resolve(self.server.manager.delete_contacts([contact_id]))
+        if not deleted:
+            raise ApiError(404, "El contacto no existe.")
+        self.send_json(200, contact_to_json(deleted[0]))
+
+    def batch(self):
+        # {"create": [contacto, ...], "update": [{"id": ..., ...}, ...], "delete": [id, ...]} en una sola transacción.
+        body = self.read_body()
+        if not isinstance(body, dict):
+            raise ApiError(400, "Se esperaba un objeto JSON.")
+        create, update, delete = [], [], []
+        for index, item in enumerate(body.get("create") or []):
+            try:
+                create.append(read_contact(item))
+            except ApiError as error:
+                raise ApiError(400, f"create[{index}]: {error}")
+        for index, item in enumerate(body.get("update") or []):
+            try:
+                if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+                    raise ApiError(400, "Falta el 'id' del contacto.")
+                update.append((item["id"],) + read_contact(item))
+            except ApiError as error:
+                raise ApiError(400, f"update[{index}]: {error}")
+        delete = body.get("delete") or []
+        if not all(isinstance(contact_id, int) for contact_id in delete):
+            raise ApiError(400, "delete: se esperaba una lista de IDs.")
+        result = resolve(self.server.manager.batch(create, update, delete))
+        self.send_json(200, {
+            "created": [contact_to_json(row) for row in result["created"]],
+            "updated": [contact_to_json(row) for row in result["updated"]],  # null si el ID no existía.
+            "deleted": [contact_to_json(row) for row in result["deleted"]],
+        })
+
+# Función que crea el servidor (sin arrancarlo) sobre un ContactManager.
+def create_server(manager, host="127.0.0.1", port=8000):
+    server = ThreadingHTTPServer((host, port), ContactHandler)
+    server.daemon_threads = True
+    server.manager = manager
+    server.instance = secrets.token_hex(4)  # Las ETag de un arranque anterior nunca coinciden.
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de contactos (sin interfaz gráfica).")
+    parser.add_argument("--db", default="data.db", help="archivo de base de datos")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección en la que escucha")
+    parser.add_argument("--port", type=int, default=8000, help="puerto en el que escucha")
+    parser.add_argument("--readers", type=int, default=4, help="conexiones de lectura")
+    parser.add_argument("--group-commit", action="store_true", help="agrupa las escrituras concurrentes en un mismo commit")
+    args = parser.parse_args()
+
+    manager = ContactManager(args.db, group_commit=args.group_commit, readers=args.readers)
+    server = create_server(manager, args.host, args.port)
+    print(f"Escuchando en http://{args.host}:{server.server_port}/contacts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.close_connection()
+
+if __name__ == "__main__":
+    main()
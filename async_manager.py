@@ -0,0 +1,54 @@
+import asyncio  # Importa asyncio para exponer las operaciones como corrutinas.
+from concurrent.futures import Future, ThreadPoolExecutor  # Importa el ejecutor dedicado a la base de datos.
+
+# Clase que ofrece versiones async de ContactManager para los manejadores de eventos de Flet.
+# Cada llamada bloqueante de sqlite3 se ejecuta en un ejecutor propio, así una consulta lenta
+# o el fsync de un commit no detienen el bucle de eventos ni al resto de controles o sesiones.
+class AsyncContactManager:
+    def __init__(self, manager, executor=None, max_workers=4):
+        self.manager = manager  # ContactManager (o CachedContactManager) síncrono.
+        # Ejecutor dedicado: no compite con el ejecutor por defecto del bucle de eventos.
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                       thread_name_prefix="contactos")
+
+    async def run(self, function, *args):
+        # Método que ejecuta 'function' en el ejecutor y espera su resultado sin bloquear.
+        result = await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        if isinstance(result, Future):
+            result = await asyncio.wrap_future(result)  # Modo group_commit: espera al commit.
+        return result
+
+    async def add_contact(self, name, age, email, phone):
+        return await self.run(self.manager.add_contact, name, age, email, phone)
+
+    async def update_contact(self, contact_id, name, age, email, phone):
+        return await self.run(self.manager.update_contact, contact_id, name, age, email, phone)
+
+    async def delete_contact(self, name):
+        return await self.run(self.manager.delete_contact, name)
+
+    async def delete_contacts(self, ids):
+        return await self.run(self.manager.delete_contacts, ids)
+
+    async def get_contact_by_id(self, contact_id):
+        return await self.run(self.manager.get_contact_by_id, contact_id)
+
+    async def get_contact_by_name(self, name):
+        return await self.run(self.manager.get_contact_by_name, name)
+
+    async def exists(self, name):
+        return await self.run(self.manager.exists, name)
+
+    async def list_contacts(self, after_id=0, limit=50, order_by="ID", descending=False, after_value=None):
+        return await self.run(self.manager.list_contacts, after_id, limit, order_by, descending, after_value)
+
+    async def count_contacts(self):
+        return await self.run(self.manager.count_contacts)
+
+    async def search(self, query, limit=50, cancelled=None):
+        return await self.run(self.manager.search, query, limit, cancelled)
+
+    def close(self):
+        # Método para detener el ejecutor y cerrar las conexiones.
+        self.executor.shutdown(wait=True)
+        self.manager.close_connection()
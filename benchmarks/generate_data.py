@@ -0,0 +1,50 @@
+import argparse  # Importa argparse para leer los argumentos de la línea de comandos.
+import os  # Importa os para construir rutas.
+import random  # Importa random para generar datos sintéticos.
+import sys  # Importa sys para poder importar los módulos del proyecto.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from contact_manager import ContactManager  # Importa el manejador de contactos.
+
+FIRST_NAMES = ["María", "José", "Ana", "Luis", "Carmen", "Jorge", "Lucía", "Pedro", "Sofía", "Andrés",
+               "Valentina", "Diego", "Camila", "Manuel", "Daniela", "Jesús", "Gabriela", "Carlos",
+               "Isabel", "Fernando", "Paula", "Ricardo", "Elena", "Javier", "Rosa", "Miguel"]
+LAST_NAMES = ["García", "Martínez", "López", "González", "Rodríguez", "Pérez", "Sánchez", "Ramírez",
+              "Torres", "Flores", "Rivera", "Gómez", "Díaz", "Cruz", "Morales", "Ortiz", "Gutiérrez",
+              "Chávez", "Ramos", "Vargas", "Castillo", "Jiménez", "Romero", "Herrera", "Medina"]
+DOMAINS = ["gmail.com", "hotmail.com", "yahoo.com", "outlook.com", "empresa.com.py"]
+
+# Función que genera 'count' contactos sintéticos (name, age, email, phone).
+# Con la misma semilla siempre genera los mismos contactos, así los resultados son comparables.
+def generate_contacts(count, seed=42):
+    rng = random.Random(seed)
+    for number in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        name = f"{first} {last}"
+        email = f"{first.lower()}.{last.lower()}{number}@{rng.choice(DOMAINS)}"
+        phone = "09" + "".join(rng.choice("0123456789") for _ in range(8))
+        yield name, rng.randint(18, 90), email, phone
+
+# Función que crea (o completa) una base de datos con 'count' contactos sintéticos.
+def fill_database(db_path, count, seed=42):
+    manager = ContactManager(db_path)
+    try:
+        existing = manager.count_contacts()
+        if existing < count:
+            # Continúa la secuencia donde quedó para que el contenido sea siempre el mismo.
+            contacts = generate_contacts(count, seed)
+            for _ in range(existing):
+                next(contacts)
+            manager.bulk_import(contacts, chunk_size=20000)
+        return manager.count_contacts()
+    finally:
+        manager.storage.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera una base de datos con contactos sintéticos.")
+    parser.add_argument("db_path", help="archivo SQLite a crear o completar")
+    parser.add_argument("count", type=int, help="cantidad de contactos")
+    parser.add_argument("--seed", type=int, default=42, help="semilla del generador")
+    args = parser.parse_args()
+    print(f"{args.db_path}: {fill_database(args.db_path, args.count, args.seed)} contactos")
@@ -0,0 +1,68 @@
+import argparse  # Importa argparse para leer los argumentos de la línea de comandos.
+import gc  # Importa gc para liberar cada representación antes de medir la siguiente.
+import json  # Importa json para guardar los resultados.
+import os  # Importa os para construir rutas.
+import sqlite3  # Importa sqlite3 para leer los contactos con distintas fábricas de filas.
+import sys  # Importa sys para poder importar los módulos del proyecto.
+import time  # Importa time para medir cuánto tarda cada carga.
+import tracemalloc  # Importa tracemalloc para medir la memoria reservada por Python.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from contact_manager import CONTACT_COLUMNS, contact_factory  # Importa el registro Contact.
+from generate_data import fill_database  # Importa el generador de datos sintéticos.
+
+FIELDS = ("id", "name", "age", "email", "phone")
+
+# Fábrica de filas que devuelve un diccionario por contacto.
+def dict_factory(cursor, row):
+    return dict(zip(FIELDS, row))
+
+# Representaciones que se comparan: nombre -> fábrica de filas (None: tuplas de sqlite3).
+FACTORIES = {
+    "tuple": None,
+    "sqlite3.Row": sqlite3.Row,
+    "dict": dict_factory,
+    "Contact": contact_factory,
+}
+
+# Función que carga todos los contactos con una fábrica de filas y mide la memoria que ocupan.
+def measure(db_path, name, factory):
+    connection = sqlite3.connect(db_path)
+    connection.row_factory = factory
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = connection.execute(f"SELECT {CONTACT_COLUMNS} FROM datos").fetchall()
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "name": name,
+        "rows": len(rows),
+        "bytes": current,
+        "bytes_per_row": round(current / len(rows), 1) if rows else None,
+        "load_s": round(elapsed, 3),  # Con tracemalloc activo: sirve para comparar, no como valor absoluto.
+    }
+    print(f"  {name:<12} {current / 2**20:9.1f} MiB  {result['bytes_per_row'] or 0:7.1f} B/fila  {elapsed:6.2f} s")
+    del rows
+    connection.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la memoria de los contactos como tuplas, dict y Contact.")
+    parser.add_argument("--size", type=int, default=1000000, help="cantidad de contactos (por defecto 1000000)")
+    parser.add_argument("--workdir", default=HERE, help="carpeta donde se guarda la base de datos generada")
+    parser.add_argument("--output", default=os.path.join(HERE, "results_memory.json"), help="archivo JSON de resultados")
+    args = parser.parse_args()
+
+    db_path = os.path.join(args.workdir, f"bench_{args.size}.db")
+    fill_database(db_path, args.size)  # Reutiliza la base si ya se había generado.
+    print(f"{args.size} contactos ({db_path})")
+    results = [measure(db_path, name, factory) for name, factory in FACTORIES.items()]
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"size": args.size, "python": sys.version.split()[0], "results": results}, file, indent=2)
+    print(f"Resultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import argparse  # Importa argparse para leer los argumentos de la línea de comandos.
+import datetime  # Importa datetime para fechar los resultados.
+import json  # Importa json para guardar los resultados en un formato legible por máquinas.
+import os  # Importa os para construir rutas.
+import platform  # Importa platform para describir la máquina.
+import sqlite3  # Importa sqlite3 para informar la versión de SQLite.
+import statistics  # Importa statistics para calcular la mediana.
+import sys  # Importa sys para poder importar los módulos del proyecto.
+import tempfile  # Importa tempfile para los archivos exportados.
+import time  # Importa time para medir.
+import types  # Importa types para construir filas de la tabla sin una página de Flet.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from contact_manager import ContactManager  # Importa el manejador de contactos.
+from generate_data import fill_database, generate_contacts  # Importa el generador de datos sintéticos.
+
+# Función que ejecuta 'function(i)' 'iterations' veces y resume los tiempos.
+def measure(name, size, function, iterations=1):
+    times = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        function(i)
+        times.append(time.perf_counter() - started)
+    times.sort()
+    total = sum(times)
+    result = {
+        "name": name,
+        "size": size,
+        "iterations": iterations,
+        "total_s": round(total, 6),
+        "mean_ms": round(total / iterations * 1000, 4),
+        "p50_ms": round(statistics.median(times) * 1000, 4),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 4),
+        "ops_per_s": round(iterations / total, 2) if total else None,
+    }
+    print(f"  {name:<28} {result['mean_ms']:>10.3f} ms/op  {result['ops_per_s'] or 0:>12.1f} op/s")
+    return result
+
+# Función que devuelve un resultado de "omitido" con el motivo.
+def skipped(name, size, reason):
+    print(f"  {name:<28} omitido ({reason})")
+    return {"name": name, "size": size, "skipped": reason}
+
+# Función que devuelve el contacto de la mitad de la tabla en orden de nombre (None si está vacía).
+def sorted_middle(manager, size):
+    if not size:
+        return None
+    with manager.storage.reading() as connection:
+        contact_id = connection.execute("SELECT ID FROM datos ORDER BY NOMBRE, ID LIMIT 1 OFFSET ?",
+                                        (size // 2,)).fetchone()[0]
+    return manager.get_contact_by_id(contact_id)
+
+# Benchmarks de ContactManager sobre una base de datos con 'size' contactos.
+def bench_manager(manager, size, iterations):
+    results = []
+    middle = size // 2  # ID aproximado en la mitad de la tabla.
+    names = [contact[0] for contact in generate_contacts(iterations, seed=7)]
+    results.append(measure("get_contact_by_id", size, lambda i: manager.get_contact_by_id(1 + (i * 7919) % size), iterations))
+    results.append(measure("get_contact_by_name", size, lambda i: manager.get_contact_by_name(names[i]), iterations))
+    results.append(measure("exists", size, lambda i: manager.exists(names[i]), iterations))
+    results.append(measure("list_contacts_first_page", size, lambda i: manager.list_contacts(0, 50), iterations))
+    results.append(measure("list_contacts_middle_page", size, lambda i: manager.list_contacts(middle, 50), iterations))
+    middle_row = sorted_middle(manager, size)  # Cursor en la mitad de la tabla ordenada por nombre.
+    results.append(measure("list_contacts_sorted_first", size,
+                           lambda i: manager.list_contacts(0, 50, "NOMBRE", i % 2 == 1), iterations))
+    results.append(measure("list_contacts_sorted_middle", size,
+                           lambda i: manager.list_contacts(middle_row.id, 50, "NOMBRE", False, middle_row.name), iterations))
+    results.append(measure("count_contacts", size, lambda i: manager.count_contacts(), iterations))
+    results.append(measure("search_prefix", size, lambda i: manager.search(names[i][:3], 50), iterations))
+    results.append(measure("search_full_name", size, lambda i: manager.search(names[i], 50), iterations))
+    added = []
+    results.append(measure("add_contact", size,
+                           lambda i: added.append(manager.add_contact("Prueba Benchmark", 30, "prueba@benchmark.com", "0990000000").id),
+                           iterations))
+    results.append(measure("update_contact", size,
+                           lambda i: manager.update_contact(added[i], "Prueba Editada", 31, "editada@benchmark.com", "0991111111"),
+                           iterations))
+    while len(added) < 100 or len(added) % 100:  # Completa lotes enteros de 100 IDs (sin medir).
+        added.append(manager.add_contact("Prueba Benchmark", 30, "prueba@benchmark.com", "0990000000").id)
+    results.append(measure("delete_contacts_100", size,
+                           lambda i: manager.delete_contacts(added[i * 100:(i + 1) * 100]),
+                           len(added) // 100))
+    manager.delete_contacts(added)  # Deja la tabla con el tamaño original.
+    results.append(measure("iter_contacts_full_scan", size,
+                           lambda i: sum(len(chunk) for chunk in manager.iter_contacts(5000))))
+    return results
+
+# Benchmark de escrituras: commit por escritura frente a commits agrupados (group_commit).
+def bench_writes(db_path, size, iterations):
+    # Las dos variantes hacen el mismo trabajo: 'iterations' altas desde un solo hilo y después
+    # su borrado en una transacción; se comparan las escrituras por segundo.
+    results = []
+    manager = ContactManager(db_path)  # Sin cola: cada add_contact es una transacción con su commit.
+    try:
+        def committed(i):
+            ids = [manager.add_contact("Prueba Cola", 30, "cola@benchmark.com", "0992222222").id for _ in range(iterations)]
+            manager.delete_contacts(ids)
+        result = measure("commit_per_write_add_batch", size, committed)
+        result["writes"] = iterations
+        result["writes_per_s"] = round(iterations / result["total_s"], 2)
+        results.append(result)
+    finally:
+        manager.storage.close()
+    manager = ContactManager(db_path, group_commit=True)
+    try:
+        def queued(i):
+            futures = [manager.add_contact("Prueba Cola", 30, "cola@benchmark.com", "0992222222") for _ in range(iterations)]
+            ids = [future.result().id for future in futures]  # Espera a que todas sean durables.
+            manager.delete_contacts(ids).result()
+        result = measure("group_commit_add_batch", size, queued)
+        result["writes"] = iterations
+        result["writes_per_s"] = round(iterations / result["total_s"], 2)
+        result["speedup"] = round(result["writes_per_s"] / results[0]["writes_per_s"], 2)  # Frente a un commit por escritura.
+        results.append(result)
+    finally:
+        manager.writer.close()
+        manager.storage.close()
+    return results
+
+# Benchmark de la construcción de filas de la tabla (lo que hace show_data con una página).
+def bench_rows(manager, size):
+    try:
+        import main  # Importa la interfaz (requiere Flet).
+    except ImportError as error:
+        return [skipped("show_data_build_rows", size, str(error))]
+    contacts = manager.list_contacts(0, 50)
+    # Objeto mínimo con lo que FormUi.build_row necesita, sin abrir una página de Flet.
+    form = types.SimpleNamespace(row_index={}, get_index=None)
+    form.cell_values = lambda x: main.FormUi.cell_values(form, x)
+    return [measure("show_data_build_rows", size,
+                    lambda i: [main.FormUi.build_row(form, x) for x in contacts], 20)]
+
+# Benchmarks de las exportaciones completas a PDF y Excel.
+def bench_exports(manager, size, skip):
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        if "pdf" in skip:
+            results.append(skipped("export_pdf", size, "--skip pdf"))
+        else:
+            try:
+                from pdf_export import PdfExportWorker  # Importa la exportación a PDF (requiere fpdf).
+            except ImportError as error:
+                results.append(skipped("export_pdf", size, str(error)))
+            else:
+                def export_pdf(i, parallel=False):
+                    worker = PdfExportWorker(manager, os.path.join(folder, "contactos.pdf"), parallel=parallel)
+                    worker.run()  # Se ejecuta en este mismo hilo.
+                    if worker.error is not None:
+                        raise worker.error
+                results.append(measure("export_pdf", size, export_pdf))
+                results.append(measure(f"export_pdf_parallel_{os.cpu_count()}", size, lambda i: export_pdf(i, True)))
+        if "excel" in skip:
+            results.append(skipped("export_excel", size, "--skip excel"))
+        else:
+            try:
+                import openpyxl  # Comprueba que la exportación a Excel se pueda ejecutar.
+                import exporter  # Importa la exportación a Excel.
+            except ImportError as error:
+                results.append(skipped("export_excel", size, str(error)))
+            else:
+                path = os.path.join(folder, "contactos.xlsx")
+                results.append(measure("export_excel", size, lambda i: exporter.export_excel(manager, path)))
+                results[-1]["bytes"] = os.path.getsize(path)
+        if "columnar" in skip:
+            results.append(skipped("export_parquet", size, "--skip columnar"))
+        else:
+            try:
+                import pyarrow  # Comprueba que las exportaciones columnares se puedan ejecutar.
+                import exporter  # Importa las exportaciones a Parquet y Arrow.
+            except ImportError as error:
+                results.append(skipped("export_parquet", size, str(error)))
+            else:
+                for name, export, extension in (("export_parquet", exporter.export_parquet, ".parquet"),
+                                                ("export_arrow", exporter.export_arrow, ".arrow")):
+                    path = os.path.join(folder, "contactos" + extension)
+                    results.append(measure(name, size, lambda i: export(manager, path)))
+                    results[-1]["bytes"] = os.path.getsize(path)  # Tamaño del archivo, para comparar formatos.
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide las operaciones de ContactManager con datos sintéticos.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="tamaños de la tabla (por defecto 10000 100000 1000000)")
+    parser.add_argument("--iterations", type=int, default=200, help="repeticiones de cada operación puntual")
+    parser.add_argument("--workdir", default=HERE, help="carpeta donde se guardan las bases de datos generadas")
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"), help="archivo JSON de resultados")
+    parser.add_argument("--label", default="", help="etiqueta para comparar configuraciones")
+    parser.add_argument("--readers", type=int, default=4, help="conexiones de lectura de ContactManager")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["pdf", "excel", "columnar", "rows", "writes"],
+                        help="benchmarks que no se ejecutan")
+    args = parser.parse_args()
+
+    report = {
+        "label": args.label,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "readers": args.readers,
+        "results": [],
+    }
+    for size in args.sizes:
+        db_path = os.path.join(args.workdir, f"bench_{size}.db")
+        started = time.perf_counter()
+        fill_database(db_path, size)  # Reutiliza la base si ya se había generado.
+        print(f"{size} contactos ({db_path}, preparada en {time.perf_counter() - started:.1f} s)")
+        manager = ContactManager(db_path, readers=args.readers)
+        try:
+            report["results"] += bench_manager(manager, size, args.iterations)
+            if "rows" not in args.skip:
+                report["results"] += bench_rows(manager, size)
+            report["results"] += bench_exports(manager, size, args.skip)
+        finally:
+            manager.storage.close()
+        if "writes" not in args.skip:
+            report["results"] += bench_writes(db_path, size, args.iterations * 10)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import threading  # Importa threading para proteger la caché entre hilos.
+from collections import OrderedDict  # Importa OrderedDict para descartar las entradas menos usadas.
+from concurrent.futures import Future  # Importa Future para reconocer escrituras en cola.
+
+# Clase de diccionario con tamaño máximo que descarta la entrada usada hace más tiempo.
+class LRUDict(OrderedDict):
+    def __init__(self, max_entries):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def lookup(self, key):
+        # Devuelve (True, valor) si la clave está y la marca como usada; si no, (False, None).
+        if key not in self:
+            return False, None
+        self.move_to_end(key)
+        return True, self[key]
+
+    def store(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.max_entries:
+            self.popitem(last=False)  # Descarta la menos usada.
+
+# Clase que envuelve a ContactManager y sirve las lecturas desde memoria.
+# Las escrituras hechas a través de ella invalidan solo las entradas afectadas; los cambios
+# hechos por otros (otra sesión, otro proceso) se detectan con change_version y vacían toda la caché.
+# Nunca se llama al ContactManager con self.lock tomado: así la caché no espera a la base de datos
+# mientras bloquea a otros hilos, ni se cruza con el hilo escritor del modo group_commit.
+class CachedContactManager:
+    def __init__(self, manager, max_entries=1024):
+        self.manager = manager  # ContactManager real.
+        self.lock = threading.RLock()
+        self.by_id = LRUDict(max_entries)  # ID -> contacto (o None).
+        self.by_name = LRUDict(max_entries)  # Nombre -> primer contacto con ese nombre (o None).
+        self.pages = LRUDict(max_entries)  # (after_id, limit, order_by, descending, after_value) -> página de list_contacts.
+        self.searches = LRUDict(max_entries)  # (query, limit) -> resultado de search.
+        self.count = None  # Resultado de count_contacts.
+        self.generation = 0  # Aumenta con cada invalidación; evita guardar lecturas hechas antes de una escritura.
+        self.hits = 0  # Lecturas servidas desde memoria.
+        self.misses = 0  # Lecturas que tuvieron que ir a la base de datos.
+        self.version = manager.change_version()  # Versión de la base de datos que refleja la caché.
+
+    def __getattr__(self, name):
+        # Todo lo que la caché no redefine se delega en el ContactManager real.
+        return getattr(self.manager, name)
+
+    def stats(self):
+        # Método que devuelve los contadores de la caché.
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.by_id) + len(self.by_name) + len(self.pages) + len(self.searches),
+            }
+
+    def clear(self):
+        # Método para vaciar toda la caché.
+        with self.lock:
+            self.generation += 1
+            self.by_id.clear()
+            self.by_name.clear()
+            self.pages.clear()
+            self.searches.clear()
+            self.count = None
+
+    def check_external_changes(self):
+        # Si hubo un commit que la caché no conoce (de otra sesión u otro proceso), ya no es fiable.
+        # La versión se lee en una conexión de solo lectura, sin esperar a la de escritura.
+        version = self.manager.change_version()
+        with self.lock:
+            if version != self.version:
+                self.clear()
+                self.version = version
+
+    def cached(self, table, key, load):
+        # Método común de lectura: devuelve la entrada guardada o la carga y la guarda.
+        self.check_external_changes()
+        with self.lock:
+            found, value = table.lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            generation = self.generation
+        value = load()
+        with self.lock:
+            if generation == self.generation:  # Solo se guarda si nada cambió durante la lectura.
+                table.store(key, value)
+        return value
+
+    # LECTURAS
+    def get_contact_by_id(self, contact_id):
+        return self.cached(self.by_id, contact_id, lambda: self.manager.get_contact_by_id(contact_id))
+
+    def get_contact_by_name(self, name):
+        return self.cached(self.by_name, name, lambda: self.manager.get_contact_by_name(name))
+
+    def exists(self, name):
+        return self.get_contact_by_name(name) is not None
+
+    def list_contacts(self, after_id=0, limit=50, order_by="ID", descending=False, after_value=None):
+        key = (after_id, limit, order_by, descending, after_value)
+        return self.cached(self.pages, key,
+                           lambda: self.manager.list_contacts(after_id, limit, order_by, descending, after_value))
+
+    def search(self, query, limit=50, cancelled=None):
+        return self.cached(self.searches, (query, limit),
+                           lambda: self.manager.search(query, limit, cancelled))
+
+    def count_contacts(self):
+        self.check_external_changes()
+        with self.lock:
+            if self.count is not None:
+                self.hits += 1
+                return self.count
+            self.misses += 1
+            generation = self.generation
+        count = self.manager.count_contacts()
+        with self.lock:
+            if generation == self.generation:
+                self.count = count
+        return count
+
+    # INVALIDACIÓN
+    def after_write(self, result, invalidate):
+        # Invalida cuando la escritura terminó; en modo cola, cuando su Future se resuelve.
+        # 'invalidate' recibe el resultado de la escritura (None si falló). Después vuelve a leer
+        # la versión: el commit propio ya quedó reflejado y no debe vaciar toda la caché. (Un commit
+        # de otro proceso que caiga justo entre los dos se detecta recién con el cambio siguiente.)
+        def run(value):
+            version = self.manager.change_version()
+            with self.lock:
+                self.generation += 1
+                invalidate(value)
+                self.version = version
+        if isinstance(result, Future):
+            result.add_done_callback(lambda future: run(None if future.exception() else future.result()))
+        else:
+            run(result)
+        return result
+
+    def forget_ids(self, ids):
+        # Descarta las entradas que contienen alguno de los IDs indicados.
+        with self.lock:
+            for contact_id in ids:
+                row = self.by_id.pop(contact_id, None)
+                if row is not None:
+                    self.by_name.pop(row.name, None)
+            for name, row in list(self.by_name.items()):
+                if row is not None and row.id in ids:
+                    del self.by_name[name]
+            # Una página por ID cambia si el ID cae dentro de su rango o justo después de una página incompleta.
+            for key, rows in list(self.pages.items()):
+                after_id, limit, order_by, descending = key[:4]
+                if order_by != "ID" or descending:
+                    del self.pages[key]  # En otro orden cualquier página puede cambiar.
+                    continue
+                last_id = rows[-1].id if len(rows) == limit else float("inf")
+                if any(after_id < contact_id <= last_id for contact_id in ids):
+                    del self.pages[key]
+            self.searches.clear()  # No se sabe qué búsquedas incluyen esos contactos.
+
+    # ESCRITURAS
+    def add_contact(self, name, age, email, phone):
+        def invalidate(row):
+            if row is not None:
+                self.by_id.pop(row.id, None)
+            self.by_name.pop(name, None)
+            self.count = None
+            # En orden de ID, las páginas incompletas del final son las únicas en las que puede aparecer el ID nuevo.
+            for key, rows in list(self.pages.items()):
+                if len(rows) < key[1] or key[2] != "ID" or key[3]:
+                    del self.pages[key]
+            self.searches.clear()
+        return self.after_write(self.manager.add_contact(name, age, email, phone), invalidate)
+
+    def update_contact(self, contact_id, name, age, email, phone):
+        def invalidate(changed):
+            self.by_name.pop(name, None)
+            self.forget_ids({contact_id})
+        return self.after_write(self.manager.update_contact(contact_id, name, age, email, phone), invalidate)
+
+    def delete_contact(self, name):
+        def invalidate(deleted):
+            self.by_name.pop(name, None)
+            self.count = None
+            if deleted is None:
+                self.clear()  # La escritura falló en la cola: no se sabe qué cambió.
+            else:
+                self.forget_ids({row.id for row in deleted})
+        return self.after_write(self.manager.delete_contact(name), invalidate)
+
+    def delete_contacts(self, ids):
+        def invalidate(deleted):
+            self.count = None
+            self.forget_ids(set(ids))
+        return self.after_write(self.manager.delete_contacts(ids), invalidate)
+
+    def batch(self, create=(), update=(), delete=()):
+        return self.after_write(self.manager.batch(create, update, delete), lambda result: self.clear())
+
+    def bulk_import(self, rows, chunk_size=5000, on_progress=None):
+        return self.after_write(self.manager.bulk_import(rows, chunk_size, on_progress), lambda total: self.clear())
@@ -1,40 +1,499 @@
+import itertools  # Importa itertools para dividir las importaciones en bloques.
+import re  # Importa el módulo de expresiones regulares para separar los términos de búsqueda.
 import sqlite3  # Importa el módulo sqlite3 para trabajar con bases de datos SQLite.
+from instrumentation import QueryMonitor  # Importa las métricas de las sentencias SQL.
+from storage import Storage  # Importa el reparto de conexiones (WAL + lectores).
+from write_queue import GroupCommitWriter  # Importa el hilo escritor con commits agrupados.
+
+# Columnas por las que se puede ordenar list_contacts (todas tienen índice).
+SORT_COLUMNS = ("ID", "NOMBRE", "EDAD", "CORREO", "TELEFONO")
+# Columnas de 'datos' que forman un Contact, en el orden de sus campos.
+CONTACT_COLUMNS = "ID, NOMBRE, EDAD, CORREO, TELEFONO"
+# Último SEQ asignado en datos_cambios (AUTOINCREMENT lo guarda en sqlite_sequence).
+LAST_SEQ_QUERY = "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'datos_cambios'), 0)"
+
+# Registro de un contacto. Con __slots__ cada instancia guarda solo sus cinco campos, sin
+# diccionario propio, y los campos se leen por nombre (contact.name) en lugar de por posición.
+class Contact:
+    __slots__ = ("id", "name", "age", "email", "phone")
+
+    def __init__(self, id, name, age, email, phone):
+        self.id = id
+        self.name = name
+        self.age = age
+        self.email = email
+        self.phone = phone
+
+    def __iter__(self):
+        # Permite desempaquetar el contacto o escribirlo como fila (Excel, PDF) en el orden de las columnas.
+        return iter((self.id, self.name, self.age, self.email, self.phone))
+
+    def __eq__(self, other):
+        return isinstance(other, Contact) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return (f"Contact(id={self.id!r}, name={self.name!r}, age={self.age!r}, "
+                f"email={self.email!r}, phone={self.phone!r})")
+
+# Fábrica de filas de sqlite3: convierte cada fila de CONTACT_COLUMNS en un Contact.
+def contact_factory(cursor, row):
+    return Contact(*row)
+
+# Registro de un cambio de changes_since: 'contact' es el Contact actual o None si ya no existe.
+class Change:
+    __slots__ = ("seq", "id", "operation", "contact")
+
+    def __init__(self, seq, id, operation, contact):
+        self.seq = seq
+        self.id = id
+        self.operation = operation  # 'I', 'U' o 'D'.
+        self.contact = contact
+
+    def __repr__(self):
+        return f"Change(seq={self.seq!r}, id={self.id!r}, operation={self.operation!r}, contact={self.contact!r})"
+
+# Registro de un contacto de iter_delta: 'contact' es el Contact actual o None si se borró;
+# 'new' indica que se creó dentro del intervalo.
+class Delta:
+    __slots__ = ("id", "contact", "new")
+
+    def __init__(self, id, contact, new):
+        self.id = id
+        self.contact = contact
+        self.new = new
+
+    def __repr__(self):
+        return f"Delta(id={self.id!r}, contact={self.contact!r}, new={self.new!r})"
+
+# Fábrica de filas para (SEQ, ID, OPERACION, seguido de CONTACT_COLUMNS del contacto actual).
+# El contacto existe si su ID en 'datos' no es NULL; los demás campos pueden serlo aunque exista.
+def change_factory(cursor, row):
+    return Change(row[0], row[1], row[2], None if row[3] is None else Contact(*row[3:]))
+
+# Fábrica de filas para (ID, NUEVO, seguido de CONTACT_COLUMNS del contacto actual).
+def delta_factory(cursor, row):
+    return Delta(row[0], None if row[2] is None else Contact(*row[2:]), bool(row[1]))
+
+# Función que devuelve un cursor cuyas filas son Contact.
+def contact_cursor(connection):
+    cursor = connection.cursor()
+    cursor.row_factory = contact_factory
+    return cursor
+
+# Lecturas que también usan los procesos de la exportación paralela a PDF, con su propia conexión.
+def select_id_range(connection, first_id, next_id=None):
+    # Cursor sobre los contactos con first_id <= ID < next_id (hasta el final si next_id es None).
+    if next_id is None:
+        return contact_cursor(connection).execute(
+            f"SELECT {CONTACT_COLUMNS} FROM datos WHERE ID >= ? ORDER BY ID", (first_id,))
+    return contact_cursor(connection).execute(
+        f"SELECT {CONTACT_COLUMNS} FROM datos WHERE ID >= ? AND ID < ? ORDER BY ID", (first_id, next_id))
+
+# Escrituras: cada función recibe la conexión donde se ejecuta, así sirven tanto para
+# la escritura directa como para el hilo escritor de GroupCommitWriter.
+# Devuelven el contacto afectado (Contact) para que la interfaz actualice solo esa fila.
+def select_contact(connection, contact_id):
+    query = f"SELECT {CONTACT_COLUMNS} FROM datos WHERE ID = ?"
+    return contact_cursor(connection).execute(query, (contact_id,)).fetchone()
+
+def insert_contact(connection, name, age, email, phone):
+    query = '''INSERT INTO datos (NOMBRE, EDAD, CORREO, TELEFONO) 
+               VALUES (?, ?, ?, ?)'''  # Consulta SQL para insertar un contacto.
+    contact_id = connection.execute(query, (name, age, email, phone)).lastrowid
+    return select_contact(connection, contact_id)  # Devuelve el contacto nuevo.
+
+def insert_contacts(connection, rows, chunk_size=5000, on_progress=None):
+    query = '''INSERT INTO datos (NOMBRE, EDAD, CORREO, TELEFONO)
+               VALUES (?, ?, ?, ?)'''  # Consulta SQL para insertar un contacto.
+    rows = iter(rows)
+    total = 0  # Cantidad de contactos insertados.
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))  # Toma el siguiente bloque.
+        if not chunk:
+            break
+        connection.executemany(query, chunk)  # Inserta el bloque completo.
+        total += len(chunk)
+        if on_progress is not None:
+            on_progress(total)  # Informa el avance.
+    return total  # Devuelve la cantidad de contactos importados.
+
+def delete_contacts_by_name(connection, name):
+    deleted = contact_cursor(connection).execute(
+        f"SELECT {CONTACT_COLUMNS} FROM datos WHERE NOMBRE = ?", (name,)).fetchall()
+    query = "DELETE FROM datos WHERE NOMBRE = ?"  # Consulta SQL para eliminar un contacto.
+    connection.execute(query, (name,))
+    return deleted  # Devuelve los contactos borrados.
+
+def delete_contacts_by_id(connection, ids, chunk_size=500):
+    ids = list(ids)
+    deleted = []
+    for start in range(0, len(ids), chunk_size):  # Bloques para no superar el límite de parámetros de SQLite.
+        chunk = ids[start:start + chunk_size]
+        marks = ", ".join("?" * len(chunk))
+        deleted += contact_cursor(connection).execute(
+            f"SELECT {CONTACT_COLUMNS} FROM datos WHERE ID IN ({marks})", chunk).fetchall()
+        connection.execute(f"DELETE FROM datos WHERE ID IN ({marks})", chunk)  # Borra por clave primaria.
+    return deleted  # Devuelve los contactos borrados.
+
+def update_contact_row(connection, contact_id, name, age, email, phone):
+    query = '''UPDATE datos SET NOMBRE = ?, EDAD = ?, CORREO = ?, TELEFONO = ?
+               WHERE ID = ?'''  # Consulta SQL para actualizar un contacto.
+    connection.execute(query, (name, age, email, phone, contact_id))
+    return select_contact(connection, contact_id)  # Devuelve el contacto actualizado (None si no existe).
+
+def delete_changes_before(connection, before_seq):
+    query = "DELETE FROM datos_cambios WHERE SEQ < ?"  # Consulta SQL para recortar el registro de cambios.
+    return connection.execute(query, (before_seq,)).rowcount  # Devuelve la cantidad de cambios borrados.
+
+def save_watermark(connection, target, seq):
+    query = '''INSERT INTO exportaciones (DESTINO, SEQ, FECHA) VALUES (?, ?, datetime('now'))
+               ON CONFLICT (DESTINO) DO UPDATE SET SEQ = excluded.SEQ, FECHA = excluded.FECHA'''
+    connection.execute(query, (target, seq))  # Guarda hasta qué cambio llegó la exportación.
+
+def apply_batch(connection, create=(), update=(), delete=()):
+    # Aplica altas, cambios y bajas en la misma transacción: o se guardan todas o ninguna.
+    return {
+        "created": [insert_contact(connection, *contact) for contact in create],
+        "updated": [update_contact_row(connection, *contact) for contact in update],  # (id, nombre, edad, correo, teléfono).
+        "deleted": delete_contacts_by_id(connection, delete),
+    }
 
 # Clase que maneja las operaciones CRUD para contactos.
 class ContactManager:
-    def __init__(self):
-        # Inicializa la conexión a la base de datos 'data.db'.
-        self.connection = sqlite3.connect("data.db", check_same_thread=False)
+    def __init__(self, db_path="data.db", group_commit=False, readers=4, instrument=True, slow_query_ms=100):
+        # Inicializa las conexiones a la base de datos (por defecto 'data.db'):
+        # una de escritura y hasta 'readers' de solo lectura, en modo WAL.
+        # Con instrument=True cada sentencia se mide; las que tardan 'slow_query_ms' o más quedan registradas.
+        self.monitor = QueryMonitor(slow_query_ms) if instrument else None
+        self.storage = Storage(db_path, readers, monitor=self.monitor)
+        self.connection = self.storage.writer  # Conexión de escritura.
+        self.create_schema()  # Asegura que la tabla y sus índices existan.
+        # Con group_commit=True las escrituras pasan por un único hilo escritor que agrupa
+        # varias en un mismo commit; los métodos de escritura devuelven entonces un Future.
+        self.writer = GroupCommitWriter(self.connection, self.storage.write_lock) if group_commit else None
+
+    def write(self, operation, *args):
+        # Método que ejecuta una escritura: la encola en el hilo escritor o la confirma al momento.
+        if self.writer is not None:
+            return self.writer.submit(operation, *args)  # Future que se resuelve tras el commit.
+        with self.storage.writing() as connection:  # Confirma los cambios o los deshace si algo falla.
+            return operation(connection, *args)
+
+    def create_schema(self):
+        # Método para crear la tabla y los índices si todavía no existen.
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS datos (
+                    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    NOMBRE TEXT,
+                    EDAD INTEGER,
+                    CORREO TEXT,
+                    TELEFONO TEXT)''')  # Misma estructura que la tabla original.
+        # Índice sobre el nombre para que las búsquedas exactas no recorran toda la tabla.
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_datos_nombre ON datos (NOMBRE)")
+        # Índices para ordenar la tabla por columna; SQLite guarda el ID en cada entrada,
+        # así ORDER BY columna, ID se lee del índice sin ordenar en memoria.
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_datos_edad ON datos (EDAD)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_datos_correo ON datos (CORREO)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_datos_telefono ON datos (TELEFONO)")
+        self.fts_enabled = self.create_search_index()  # Índice de texto completo para search().
+        self.create_change_log()  # Registro de cambios para la sincronización incremental.
+        self.connection.commit()  # Confirma los cambios en la base de datos.
+
+    def create_search_index(self):
+        # Método para crear el índice FTS5 sobre nombre, correo y teléfono, sincronizado por triggers.
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'datos_fts'").fetchone() is not None
+        try:
+            self.connection.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS datos_fts USING fts5(
+                        NOMBRE, CORREO, TELEFONO,
+                        content='datos', content_rowid='ID',
+                        tokenize='unicode61 remove_diacritics 2', prefix='2 3')''')
+        except sqlite3.OperationalError:
+            return False  # SQLite compilado sin FTS5: search() usará LIKE.
+        # Triggers que mantienen el índice al día con cada cambio en 'datos'.
+        self.connection.executescript('''
+            CREATE TRIGGER IF NOT EXISTS datos_fts_ai AFTER INSERT ON datos BEGIN
+                INSERT INTO datos_fts (rowid, NOMBRE, CORREO, TELEFONO)
+                VALUES (new.ID, new.NOMBRE, new.CORREO, new.TELEFONO);
+            END;
+            CREATE TRIGGER IF NOT EXISTS datos_fts_ad AFTER DELETE ON datos BEGIN
+                INSERT INTO datos_fts (datos_fts, rowid, NOMBRE, CORREO, TELEFONO)
+                VALUES ('delete', old.ID, old.NOMBRE, old.CORREO, old.TELEFONO);
+            END;
+            CREATE TRIGGER IF NOT EXISTS datos_fts_au AFTER UPDATE ON datos BEGIN
+                INSERT INTO datos_fts (datos_fts, rowid, NOMBRE, CORREO, TELEFONO)
+                VALUES ('delete', old.ID, old.NOMBRE, old.CORREO, old.TELEFONO);
+                INSERT INTO datos_fts (rowid, NOMBRE, CORREO, TELEFONO)
+                VALUES (new.ID, new.NOMBRE, new.CORREO, new.TELEFONO);
+            END;
+        ''')
+        if not exists:
+            # Primera vez: indexa los contactos que ya estaban en la tabla.
+            self.connection.execute("INSERT INTO datos_fts (datos_fts) VALUES ('rebuild')")
+        return True
+
+    def create_change_log(self):
+        # Método para crear el registro de cambios: cada alta, cambio o baja en 'datos' agrega una fila
+        # con un número de secuencia creciente (AUTOINCREMENT no reutiliza números aunque se borren filas).
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS datos_cambios (
+                SEQ INTEGER PRIMARY KEY AUTOINCREMENT,
+                ID INTEGER NOT NULL,
+                OPERACION TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS exportaciones (
+                DESTINO TEXT PRIMARY KEY,
+                SEQ INTEGER NOT NULL,
+                FECHA TEXT);
+            CREATE TRIGGER IF NOT EXISTS datos_cambios_ai AFTER INSERT ON datos BEGIN
+                INSERT INTO datos_cambios (ID, OPERACION) VALUES (new.ID, 'I');
+            END;
+            CREATE TRIGGER IF NOT EXISTS datos_cambios_ad AFTER DELETE ON datos BEGIN
+                INSERT INTO datos_cambios (ID, OPERACION) VALUES (old.ID, 'D');
+            END;
+            CREATE TRIGGER IF NOT EXISTS datos_cambios_au AFTER UPDATE ON datos BEGIN
+                INSERT INTO datos_cambios (ID, OPERACION) VALUES (new.ID, 'U');
+            END;
+        ''')
 
     def add_contact(self, name, age, email, phone):
         # Método para agregar un nuevo contacto a la base de datos.
-        query = '''INSERT INTO datos (NOMBRE, EDAD, CORREO, TELEFONO) 
-                   VALUES (?, ?, ?, ?)'''  # Consulta SQL para insertar un contacto.
-        self.connection.execute(query, (name, age, email, phone))  # Ejecuta la consulta con los datos proporcionados.
-        self.connection.commit()  # Confirma los cambios en la base de datos.
+        return self.write(insert_contact, name, age, email, phone)
+
+    def bulk_import(self, rows, chunk_size=5000, on_progress=None):
+        # Método para insertar muchos contactos (name, age, email, phone) en una sola transacción.
+        # Consume 'rows' por bloques, así que acepta generadores sin cargarlos enteros en memoria.
+        return self.write(insert_contacts, rows, chunk_size, on_progress)
 
     def get_contacts(self):
         # Método para obtener todos los contactos de la base de datos.
-        cursor = self.connection.cursor()  # Crea un cursor para ejecutar consultas.
-        query = "SELECT * FROM datos"  # Consulta SQL para seleccionar todos los contactos.
-        cursor.execute(query)  # Ejecuta la consulta.
-        contacts = cursor.fetchall()  # Obtiene todos los resultados de la consulta.
+        with self.storage.reading() as connection:
+            cursor = contact_cursor(connection)  # Crea un cursor que devuelve Contact.
+            query = f"SELECT {CONTACT_COLUMNS} FROM datos"  # Consulta SQL para seleccionar todos los contactos.
+            cursor.execute(query)  # Ejecuta la consulta.
+            contacts = cursor.fetchall()  # Obtiene todos los resultados de la consulta.
         return contacts  # Devuelve la lista de contactos.
 
+    def count_contacts(self):
+        # Método para contar los contactos guardados.
+        with self.storage.reading() as connection:
+            return connection.execute("SELECT COUNT(*) FROM datos").fetchone()[0]
+
+    def iter_contacts(self, chunk_size=1000):
+        # Método para recorrer todos los contactos por bloques sin cargarlos a la vez en memoria.
+        # La conexión de lectura queda reservada durante todo el recorrido (una misma foto de la tabla).
+        with self.storage.reading() as connection:
+            cursor = contact_cursor(connection).execute(
+                f"SELECT {CONTACT_COLUMNS} FROM datos ORDER BY ID")  # Cursor propio del recorrido.
+            try:
+                while True:
+                    chunk = cursor.fetchmany(chunk_size)  # Lee el siguiente bloque de filas.
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                cursor.close()  # Cierra el cursor aunque el recorrido se interrumpa.
+
+    def block_starts(self, block_size):
+        # Método que divide la tabla en bloques consecutivos de 'block_size' contactos (en orden de ID)
+        # y devuelve el primer ID de cada bloque. Recorre solo la clave primaria.
+        query = '''SELECT ID FROM (SELECT ID, ROW_NUMBER() OVER (ORDER BY ID) AS N FROM datos)
+                   WHERE (N - 1) % ? = 0 ORDER BY ID'''
+        with self.storage.reading() as connection:
+            return [row[0] for row in connection.execute(query, (block_size,)).fetchall()]
+
+    def list_contacts(self, after_id=0, limit=50, order_by="ID", descending=False, after_value=None):
+        # Método para obtener una página de contactos con paginación por clave (keyset).
+        # Solo lee 'limit' filas a partir del último contacto visto, sin importar el tamaño de la tabla.
+        # Con 'order_by' la página sale ordenada por esa columna (y por ID en los empates) leyendo su índice;
+        # la página siguiente empieza tras (after_value, after_id) del último contacto mostrado.
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"No se puede ordenar por {order_by!r}.")
+        direction = "DESC" if descending else "ASC"
+        operator = "<" if descending else ">"
+        if order_by == "ID":
+            where = f"WHERE ID {operator} ?" if after_id else ""
+            parts = [(where, (after_id,) if after_id else ())]
+        elif not after_id:
+            parts = [("", ())]
+        elif after_value is None:
+            # La página anterior terminó en un contacto sin valor (NULL): sigue entre los NULL por ID y,
+            # en orden ascendente, después vienen los que tienen valor (SQLite pone los NULL primero).
+            parts = [(f"WHERE {order_by} IS NULL AND ID {operator} ?", (after_id,))]
+            if not descending:
+                parts.append((f"WHERE {order_by} IS NOT NULL", ()))
+        else:
+            # Una comparación con NULL no es verdadera: en orden descendente los NULL van en un tramo aparte, al final.
+            parts = [(f"WHERE ({order_by}, ID) {operator} (?, ?)", (after_value, after_id))]
+            if descending:
+                parts.append((f"WHERE {order_by} IS NULL", ()))
+        order = f"ID {direction}" if order_by == "ID" else f"{order_by} {direction}, ID {direction}"
+        contacts = []
+        with self.storage.reading() as connection:
+            for where, parameters in parts:  # Cada tramo lee su parte del índice, en orden.
+                query = f"SELECT {CONTACT_COLUMNS} FROM datos {where} ORDER BY {order} LIMIT ?"
+                contacts += contact_cursor(connection).execute(query, parameters + (limit - len(contacts),)).fetchall()
+                if len(contacts) >= limit:
+                    break
+        return contacts  # Devuelve la página de contactos.
+
+    def search(self, query, limit=50, cancelled=None):
+        # Método para buscar contactos por prefijo en nombre, correo o teléfono, ordenados por relevancia.
+        # Si se pasa 'cancelled', SQLite interrumpe la consulta en cuanto devuelve True.
+        terms = re.findall(r"\w+", query)  # Separa la búsqueda en palabras.
+        if not terms:
+            return []
+        if not self.fts_enabled:
+            # Sin FTS5 se recurre a LIKE sobre el nombre (recorre la tabla).
+            sql = f"SELECT {CONTACT_COLUMNS} FROM datos WHERE NOMBRE LIKE ? ORDER BY ID LIMIT ?"
+            params = (f"%{query.strip()}%", limit)
+        else:
+            match = " ".join(f'"{term}"*' for term in terms)  # Cada palabra se busca como prefijo.
+            sql = '''SELECT datos.ID, datos.NOMBRE, datos.EDAD, datos.CORREO, datos.TELEFONO FROM datos_fts
+                     JOIN datos ON datos.ID = datos_fts.rowid
+                     WHERE datos_fts MATCH ?
+                     ORDER BY datos_fts.rank LIMIT ?'''  # Ordena por relevancia (bm25).
+            params = (match, limit)
+        with self.storage.reading() as connection:
+            if cancelled is not None:
+                # Comprueba la cancelación cada 1000 instrucciones de la máquina virtual de SQLite.
+                connection.set_progress_handler(lambda: 1 if cancelled() else 0, 1000)
+            try:
+                return contact_cursor(connection).execute(sql, params).fetchall()  # Devuelve los contactos encontrados.
+            finally:
+                if cancelled is not None:
+                    connection.set_progress_handler(None, 0)  # Retira el controlador de cancelación.
+
+    def get_contact_by_id(self, contact_id):
+        # Método para obtener un contacto por su ID (búsqueda por clave primaria).
+        with self.storage.reading() as connection:
+            return select_contact(connection, contact_id)  # Devuelve el contacto o None.
+
+    def get_contact_by_name(self, name):
+        # Método para obtener el primer contacto con un nombre exacto (usa idx_datos_nombre).
+        query = f"SELECT {CONTACT_COLUMNS} FROM datos WHERE NOMBRE = ? ORDER BY ID LIMIT 1"  # Consulta SQL por nombre.
+        with self.storage.reading() as connection:
+            return contact_cursor(connection).execute(query, (name,)).fetchone()  # Devuelve el contacto o None.
+
+    def exists(self, name):
+        # Método para comprobar si ya existe un contacto con ese nombre.
+        query = "SELECT 1 FROM datos WHERE NOMBRE = ? LIMIT 1"  # Solo consulta el índice.
+        with self.storage.reading() as connection:
+            return connection.execute(query, (name,)).fetchone() is not None
+
+    def changes_since(self, seq=0, limit=1000):
+        # Método para leer los cambios posteriores a 'seq', en orden, sin recorrer la tabla 'datos'.
+        # Cada cambio es un Change con 'I', 'U' o 'D' y el contacto actual (None si ya no existe).
+        # Para sincronizar basta con guardar el contacto si lo hay o borrarlo si no, y seguir
+        # desde el último SEQ recibido.
+        query = '''SELECT c.SEQ, c.ID, c.OPERACION, d.ID, d.NOMBRE, d.EDAD, d.CORREO, d.TELEFONO
+                   FROM datos_cambios c LEFT JOIN datos d ON d.ID = c.ID
+                   WHERE c.SEQ > ? ORDER BY c.SEQ LIMIT ?'''
+        with self.storage.reading() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = change_factory
+            return cursor.execute(query, (seq, limit)).fetchall()
+
+    def latest_change(self):
+        # Método que devuelve el último SEQ asignado (0 si no hubo cambios): desde ahí sigue
+        # quien acaba de leer la tabla completa. Se lee de sqlite_sequence, que lo conserva
+        # aunque prune_changes haya vaciado el registro.
+        with self.storage.reading() as connection:
+            return connection.execute(LAST_SEQ_QUERY).fetchone()[0]
+
+    def has_changes_since(self, seq):
+        # Método que indica si el registro todavía guarda todos los cambios posteriores a 'seq'
+        # (no, si prune_changes ya borró alguno de ellos).
+        with self.storage.reading() as connection:
+            first = connection.execute("SELECT MIN(SEQ) FROM datos_cambios").fetchone()[0]
+            if first is None:
+                # Registro vacío: solo está completo si después de 'seq' no se asignó ningún SEQ.
+                return connection.execute(LAST_SEQ_QUERY).fetchone()[0] <= seq
+        return first <= seq + 1
+
+    def count_delta(self, since_seq, until_seq):
+        # Método que cuenta los contactos distintos que cambiaron entre 'since_seq' y 'until_seq'.
+        query = "SELECT COUNT(DISTINCT ID) FROM datos_cambios WHERE SEQ > ? AND SEQ <= ?"
+        with self.storage.reading() as connection:
+            return connection.execute(query, (since_seq, until_seq)).fetchone()[0]
+
+    def iter_delta(self, since_seq, until_seq, chunk_size=1000):
+        # Método para recorrer por bloques los contactos que cambiaron entre dos SEQ, una vez cada uno.
+        # Cada fila es un Delta: con contacto, se agrega o reemplaza; sin contacto (None), se borró
+        # (si 'new' es verdadero se creó y borró en el intervalo y se puede omitir).
+        # Solo lee el registro de cambios del intervalo y las filas de esos contactos.
+        query = '''SELECT c.ID, c.NUEVO, d.ID, d.NOMBRE, d.EDAD, d.CORREO, d.TELEFONO
+                   FROM (SELECT ID, MAX(OPERACION = 'I') AS NUEVO FROM datos_cambios
+                         WHERE SEQ > ? AND SEQ <= ? GROUP BY ID) c
+                   LEFT JOIN datos d ON d.ID = c.ID ORDER BY c.ID'''
+        with self.storage.reading() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = delta_factory
+            cursor.execute(query, (since_seq, until_seq))
+            try:
+                while True:
+                    chunk = cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                cursor.close()
+
+    def export_watermark(self, target):
+        # Método que devuelve el SEQ hasta el que llegó la última exportación a 'target' (0 si nunca se exportó).
+        with self.storage.reading() as connection:
+            row = connection.execute("SELECT SEQ FROM exportaciones WHERE DESTINO = ?", (target,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def save_export_watermark(self, target, seq):
+        # Método para registrar que 'target' ya tiene todos los cambios hasta 'seq'.
+        return self.write(save_watermark, target, seq)
+
+    def prune_changes(self, before_seq):
+        # Método para borrar los cambios con SEQ menor que 'before_seq' (los que ya leyeron todos los consumidores).
+        return self.write(delete_changes_before, before_seq)
+
     def delete_contact(self, name):
         # Método para eliminar un contacto basado en su nombre.
-        query = "DELETE FROM datos WHERE NOMBRE = ?"  # Consulta SQL para eliminar un contacto.
-        self.connection.execute(query, (name,))  # Ejecuta la consulta con el nombre proporcionado.
-        self.connection.commit()  # Confirma los cambios en la base de datos.
+        return self.write(delete_contacts_by_name, name)
+
+    def delete_contacts(self, ids):
+        # Método para eliminar varios contactos por ID en una sola transacción (un único commit).
+        return self.write(delete_contacts_by_id, ids)
 
     def update_contact(self, contact_id, name, age, email, phone):
         # Método para actualizar un contacto existente en la base de datos.
-        query = '''UPDATE datos SET NOMBRE = ?, EDAD = ?, CORREO = ?, TELEFONO = ?
-                   WHERE ID = ?'''  # Consulta SQL para actualizar un contacto.
-        self.connection.execute(query, (name, age, email, phone, contact_id))  # Ejecuta la consulta con los nuevos datos.
-        self.connection.commit()  # Confirma los cambios en la base de datos.
+        return self.write(update_contact_row, contact_id, name, age, email, phone)
+
+    def batch(self, create=(), update=(), delete=()):
+        # Método para aplicar varias altas, cambios y bajas en una sola transacción (un único commit).
+        return self.write(apply_batch, list(create), list(update), list(delete))
+
+    def change_version(self):
+        # Método que devuelve un número que cambia con cada commit, propio o de otra conexión.
+        return self.storage.change_version()
+
+    # MÉTRICAS
+    def query_stats(self):
+        # Método que devuelve las métricas de SQL (tiempos por sentencia, filas, commits y consultas lentas).
+        if self.monitor is None:
+            return None
+        return self.monitor.snapshot()
+
+    def dump_query_stats(self, path):
+        # Método para guardar las métricas de SQL en un archivo JSON.
+        if self.monitor is not None:
+            self.monitor.dump_json(path)
+
+    def set_slow_query_threshold(self, milliseconds):
+        # Método para cambiar el umbral de consultas lentas sin reiniciar.
+        if self.monitor is not None:
+            self.monitor.slow_threshold_ms = milliseconds
 
     def close_connection(self):
         # Método para cerrar la conexión a la base de datos.
-        self.connection.close()  # Cierra la conexión.
+        if self.writer is not None:
+            self.writer.close()  # Confirma las escrituras pendientes y detiene el hilo escritor.
+        self.storage.close()  # Cierra las conexiones.
         print("cerrar")  # Imprime un mensaje indicando que se ha cerrado la conexión.
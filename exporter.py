@@ -0,0 +1,117 @@
+from concurrent.futures import Future  # Importa Future para esperar escrituras en cola.
+
+HEADER = ("ID", "Nombre", "Edad", "Correo", "Teléfono")  # Encabezado de las exportaciones.
+
+# Función que decide qué exporta 'target': devuelve (since_seq, until_seq).
+# since_seq es None si hay que exportar todo: se pidió completa, 'target' nunca se exportó
+# o el registro de cambios ya no guarda todos los cambios desde su última exportación.
+def plan_export(manager, target, delta):
+    until_seq = manager.latest_change()  # Se lee antes que los datos: lo posterior sale en la próxima exportación.
+    since_seq = manager.export_watermark(target) if delta else 0
+    if not since_seq or not manager.has_changes_since(since_seq):
+        return None, until_seq
+    return since_seq, until_seq
+
+# Función que registra hasta qué cambio llegó la exportación, una vez guardado el archivo.
+def finish_export(manager, target, until_seq):
+    result = manager.save_export_watermark(target, until_seq)
+    if isinstance(result, Future):
+        result.result()  # Modo group_commit: espera al commit.
+
+# Función que recorre los cambios entre dos SEQ: devuelve bloques de contactos a agregar o
+# reemplazar y anota en 'deleted' los IDs borrados.
+def iter_delta_rows(manager, since_seq, until_seq, deleted, chunk_size=1000):
+    for chunk in manager.iter_delta(since_seq, until_seq, chunk_size):
+        rows = []
+        for delta in chunk:
+            if delta.contact is not None:
+                rows.append(delta.contact)
+            elif not delta.new:  # Creado y borrado después de la última exportación: el destino nunca lo vio.
+                deleted.append(delta.id)
+        yield rows
+
+# Función que exporta los contactos a Excel con memoria constante.
+# Lee la base de datos por bloques y escribe con el modo 'write_only' de openpyxl,
+# que vuelca cada fila al archivo en lugar de guardar la hoja entera en memoria.
+# Con delta=True solo escribe los contactos nuevos o cambiados desde la última exportación
+# a 'target' y agrega la hoja "Eliminados" con los IDs borrados. Devuelve un resumen.
+def export_excel(manager, file_name, chunk_size=1000, delta=False, target="excel"):
+    from openpyxl import Workbook  # Se importa solo cuando se necesita.
+    since_seq, until_seq = plan_export(manager, target, delta)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")  # Mismo nombre de hoja que usaba pandas.
+    sheet.append(HEADER)
+    written = 0
+    deleted = []
+    if since_seq is None:
+        chunks = manager.iter_contacts(chunk_size)  # Recorre los contactos bloque a bloque.
+    else:
+        chunks = iter_delta_rows(manager, since_seq, until_seq, deleted, chunk_size)
+    for chunk in chunks:
+        for row in chunk:
+            sheet.append(tuple(row))  # Contact o fila del registro de cambios, en el orden de HEADER.
+        written += len(chunk)
+    if since_seq is not None:
+        removed = workbook.create_sheet("Eliminados")
+        removed.append(("ID",))
+        for contact_id in deleted:
+            removed.append((contact_id,))
+    workbook.save(file_name)  # Guarda el archivo Excel.
+    finish_export(manager, target, until_seq)
+    return {"delta": since_seq is not None, "rows": written, "deleted": len(deleted)}
+
+# Función que convierte la edad guardada en un entero (None si no es un número).
+def to_age(value):
+    if isinstance(value, int) or value is None:
+        return value
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+# Función que recorre los contactos como lotes de columnas de Arrow con tipos fijos.
+def contact_batches(manager, schema, chunk_size):
+    import pyarrow as pa  # Se importa solo cuando se necesita.
+    for chunk in manager.iter_contacts(chunk_size):
+        ids, names, ages, emails, phones = zip(*(tuple(contact)[:5] for contact in chunk))
+        yield pa.record_batch([
+            pa.array(ids, pa.int64()),
+            pa.array([None if value is None else str(value) for value in names], pa.string()),
+            pa.array([to_age(value) for value in ages], pa.int32()),
+            pa.array([None if value is None else str(value) for value in emails], pa.string()),
+            pa.array([None if value is None else str(value) for value in phones], pa.string()),
+        ], schema=schema)
+
+# Esquema de las exportaciones columnares: mismos encabezados que Excel, edad como entero.
+def arrow_schema():
+    import pyarrow as pa  # Se importa solo cuando se necesita.
+    return pa.schema([
+        (HEADER[0], pa.int64()),
+        (HEADER[1], pa.string()),
+        (HEADER[2], pa.int32()),
+        (HEADER[3], pa.string()),
+        (HEADER[4], pa.string()),
+    ])
+
+# Función que exporta todos los contactos a Parquet (comprimido con zstd), un grupo de filas por bloque.
+# Devuelve la cantidad de contactos escritos.
+def export_parquet(manager, file_name, chunk_size=50000):
+    import pyarrow.parquet as pq  # Se importa solo cuando se necesita.
+    schema = arrow_schema()
+    written = 0
+    with pq.ParquetWriter(file_name, schema, compression="zstd") as writer:
+        for batch in contact_batches(manager, schema, chunk_size):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+# Función que exporta todos los contactos a un archivo Arrow IPC (formato de archivo, comprimido con zstd).
+# Devuelve la cantidad de contactos escritos.
+def export_arrow(manager, file_name, chunk_size=50000):
+    import pyarrow as pa  # Se importa solo cuando se necesita.
+    schema = arrow_schema()
+    written = 0
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.OSFile(file_name, "wb") as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+        for batch in contact_batches(manager, schema, chunk_size):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
@@ -0,0 +1,116 @@
+import csv  # Importa csv para leer archivos CSV fila a fila.
+import os  # Importa os para reconocer la extensión del archivo.
+import unicodedata  # Importa unicodedata para normalizar los encabezados.
+from validation import FIELDS, validate_batch  # Importa las validaciones compartidas con el formulario.
+
+# Las columnas que se esperan en el archivo son FIELDS (mismos encabezados que la exportación a Excel).
+VALIDATION_BATCH = 20000  # Filas que se validan juntas.
+MAX_ERRORS = 1000  # Máximo de errores que se guardan con detalle.
+
+# Clase que resume el resultado de una importación.
+class ImportReport:
+    def __init__(self):
+        self.imported = 0  # Contactos insertados.
+        self.error_count = 0  # Filas rechazadas.
+        self.errors = []  # Primeros errores como (número de fila, mensaje).
+
+    def add_error(self, line, message):
+        # Método para registrar una fila rechazada sin guardar más de MAX_ERRORS mensajes.
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+# Función para convertir un encabezado como 'Teléfono' en 'telefono'.
+def normalize_header(value):
+    text = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode()
+    return text.strip().lower()
+
+# Función que recorre un CSV y devuelve (número de fila, valores) sin leer el archivo completo.
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        for line, values in enumerate(csv.reader(file), start=1):
+            yield line, values
+
+# Función que recorre un XLSX en modo solo lectura (openpyxl no carga la hoja entera).
+def read_xlsx(path):
+    from openpyxl import load_workbook  # Se importa solo cuando se necesita.
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for line, values in enumerate(workbook.active.iter_rows(values_only=True), start=1):
+            yield line, values
+    finally:
+        workbook.close()  # Libera el archivo.
+
+# Función que recorre lotes de columnas de Arrow como filas: primero los nombres de columna,
+# después los valores ya tipados (la edad llega como entero).
+def read_batches(schema, batches):
+    yield 1, schema.names
+    line = 1
+    for batch in batches:
+        for values in zip(*(column.to_pylist() for column in batch.columns)):
+            line += 1
+            yield line, values
+
+# Función que recorre un Parquet por lotes (no carga el archivo entero).
+def read_parquet(path, batch_size=50000):
+    import pyarrow.parquet as pq  # Se importa solo cuando se necesita.
+    with pq.ParquetFile(path) as file:
+        yield from read_batches(file.schema_arrow, file.iter_batches(batch_size))
+
+# Función que recorre un archivo Arrow IPC lote a lote, leyéndolo con memoria mapeada.
+def read_arrow(path):
+    import pyarrow as pa  # Se importa solo cuando se necesita.
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        yield from read_batches(reader.schema, (reader.get_batch(i) for i in range(reader.num_record_batches)))
+
+# Función que elige el lector según la extensión del archivo.
+def read_rows(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return read_csv(path)
+    if extension == ".xlsx":
+        return read_xlsx(path)
+    if extension == ".parquet":
+        return read_parquet(path)
+    if extension in (".arrow", ".feather"):
+        return read_arrow(path)
+    raise ValueError(f"Formato no soportado: {extension}")
+
+# Función que convierte las filas leídas en contactos válidos y anota los errores en el reporte.
+# Las filas se validan por bloques de VALIDATION_BATCH con validate_batch.
+def valid_contacts(rows, report):
+    columns = None  # Posición de cada campo, según el encabezado.
+    batch = []  # Filas pendientes de validar.
+    lines = []  # Línea del archivo de cada fila pendiente.
+    for line, values in rows:
+        if columns is None:
+            headers = [normalize_header(value) for value in values]
+            missing = [field for field in FIELDS if field not in headers]
+            if missing:
+                report.add_error(line, "Faltan columnas: " + ", ".join(missing))
+                return
+            columns = [headers.index(field) for field in FIELDS]
+            continue
+        if not any(values):
+            continue  # Ignora filas vacías.
+        batch.append(tuple(values[index] if index < len(values) else None for index in columns))
+        lines.append(line)
+        if len(batch) >= VALIDATION_BATCH:
+            yield from validate_lines(batch, lines, report)
+            batch, lines = [], []
+    if batch:
+        yield from validate_lines(batch, lines, report)
+
+# Función que valida un bloque de filas de una vez, anota los errores con su línea y devuelve los contactos válidos.
+def validate_lines(batch, lines, report):
+    contacts, errors = validate_batch(batch)
+    for position, error in errors:
+        report.add_error(lines[position], error)
+    return contacts
+
+# Función principal: importa un CSV/XLSX/Parquet/Arrow con ContactManager.bulk_import en una sola transacción.
+def import_file(manager, path, chunk_size=5000, on_progress=None):
+    report = ImportReport()
+    report.imported = manager.bulk_import(valid_contacts(read_rows(path), report), chunk_size, on_progress)
+    return report
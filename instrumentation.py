@@ -0,0 +1,139 @@
+import json  # Importa json para volcar las métricas a un archivo.
+import sqlite3  # Importa sqlite3 para extender sus clases de conexión y cursor.
+import threading  # Importa threading para proteger los contadores entre hilos.
+import time  # Importa time para medir cada sentencia.
+from collections import deque  # Importa deque para el registro limitado de consultas lentas.
+
+# Clase que acumula métricas de las sentencias SQL: tiempo por sentencia, filas devueltas,
+# commits y un registro de las consultas que superan el umbral de lentitud.
+class QueryMonitor:
+    def __init__(self, slow_threshold_ms=100, slow_log_size=200):
+        self.slow_threshold_ms = slow_threshold_ms  # Umbral (ms) a partir del cual una llamada se registra como lenta.
+        self.lock = threading.Lock()
+        self.slow_queries = deque(maxlen=slow_log_size)  # Últimas consultas lentas.
+        self.reset()
+
+    def reset(self):
+        # Método para poner todos los contadores a cero.
+        with self.lock:
+            self.statements = {}  # SQL -> métricas acumuladas.
+            self.commits = 0
+            self.rows_returned = 0
+            self.slow_queries.clear()
+
+    def record(self, sql, elapsed, rows=0, phase="execute"):
+        # Método que registra una llamada (ejecución o lectura de filas) de una sentencia.
+        sql = " ".join(sql.split())  # Normaliza espacios para agrupar la misma sentencia.
+        elapsed_ms = elapsed * 1000
+        with self.lock:
+            stats = self.statements.get(sql)
+            if stats is None:
+                stats = self.statements[sql] = {"sql": sql, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+            if phase == "execute":
+                stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += rows
+            self.rows_returned += rows
+            if elapsed_ms >= self.slow_threshold_ms:
+                self.slow_queries.append({
+                    "sql": sql,
+                    "phase": phase,
+                    "ms": round(elapsed_ms, 3),
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                })
+
+    def record_commit(self):
+        with self.lock:
+            self.commits += 1
+
+    def snapshot(self):
+        # Método que devuelve una copia de las métricas, lista para convertir a JSON.
+        with self.lock:
+            statements = []
+            for stats in self.statements.values():
+                item = dict(stats)
+                item["total_ms"] = round(item["total_ms"], 3)
+                item["max_ms"] = round(item["max_ms"], 3)
+                item["mean_ms"] = round(stats["total_ms"] / stats["count"], 3) if stats["count"] else None
+                statements.append(item)
+            statements.sort(key=lambda item: item["total_ms"], reverse=True)  # Las más costosas primero.
+            return {
+                "commits": self.commits,
+                "rows_returned": self.rows_returned,
+                "slow_threshold_ms": self.slow_threshold_ms,
+                "statements": statements,
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def dump_json(self, path):
+        # Método para guardar la foto de las métricas en un archivo JSON.
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2, ensure_ascii=False)
+
+# Funciones que cuentan las filas de cada llamada del cursor.
+def no_rows(result):
+    return 0
+
+def one_row(result):
+    return 0 if result is None else 1
+
+# Cursor que mide cada ejecución y cuenta las filas que devuelve.
+class InstrumentedCursor(sqlite3.Cursor):
+    last_sql = ""  # Última sentencia ejecutada; las lecturas de filas se le atribuyen.
+
+    def timed(self, phase, sql, count, call, *args):
+        # 'count' recibe el resultado y devuelve cuántas filas trajo (la fila puede ser una tupla o un Contact).
+        started = time.perf_counter()
+        result = call(*args)
+        elapsed = time.perf_counter() - started
+        monitor = self.connection.monitor
+        if monitor is not None:
+            monitor.record(sql, elapsed, count(result), phase)
+        return result
+
+    def execute(self, sql, parameters=()):
+        self.last_sql = sql
+        return self.timed("execute", sql, no_rows, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self.last_sql = sql
+        return self.timed("execute", sql, no_rows, super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        return self.timed("fetch", self.last_sql, one_row, super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self.timed("fetch", self.last_sql, len, super().fetchmany,
+                          size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self.timed("fetch", self.last_sql, len, super().fetchall)
+
+# Conexión que crea cursores medidos y cuenta los commits.
+# Se usa como 'factory' de sqlite3.connect; 'monitor' se asigna después de conectar.
+class InstrumentedConnection(sqlite3.Connection):
+    monitor = None  # QueryMonitor que recibe las métricas.
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        pending = self.in_transaction  # Solo cuenta los commits que confirman algo.
+        super().commit()
+        if pending and self.monitor is not None:
+            self.monitor.record_commit()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 'with connection:' confirma sin pasar por commit(); también se cuenta.
+        pending = self.in_transaction and exc_type is None
+        result = super().__exit__(exc_type, exc_value, traceback)
+        if pending and self.monitor is not None:
+            self.monitor.record_commit()
+        return result
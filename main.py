@@ -1,28 +1,58 @@
-import re  # Importa el módulo de expresiones regulares para validar entradas.
+import time  # Importa time para medir el tiempo de arranque.
+STARTED = time.perf_counter()  # Momento en que empezó a cargarse el programa.
 import flet as ft  # Importa Flet para construir la interfaz de usuario.
 from contact_manager import ContactManager  # Importa el manejador de contactos.
-from fpdf import FPDF  # Importa FPDF para la generación de PDFs.
-import pandas as pd  # Importa pandas para la manipulación de datos.
+from cache import CachedContactManager  # Importa la caché de lecturas.
+from async_manager import AsyncContactManager  # Importa la versión async para los manejadores de eventos.
+from search_pipeline import SearchPipeline  # Importa el buscador con espera y cancelación.
+from validation import validate_contact  # Importa las validaciones compartidas con la importación.
 import datetime  # Importa datetime para manejar fechas y horas.
+import threading  # Importa threading para importar archivos sin bloquear la interfaz.
+import importer  # Importa el lector de archivos CSV/XLSX/Parquet/Arrow.
+import exporter  # Importa la exportación por bloques.
+# pdf_export (y con él fpdf) se importa en save_pdf, la primera vez que se usa.
+IMPORTED = time.perf_counter()  # Momento en que terminaron las importaciones.
 
-# Clase que define el encabezado y pie de página de un PDF.
-class PDF(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 12)  # Establece la fuente para el encabezado.
-        self.cell(0, 10, 'Tabla de Datos', 0, 1, 'C')  # Añade el título en el centro.
+# Columnas de la base de datos que muestra cada columna de la tabla (en el mismo orden).
+SORT_FIELDS = ("NOMBRE", "EDAD", "CORREO", "TELEFONO")
+SORT_ATTRIBUTES = ("name", "age", "email", "phone")  # Atributo de Contact de cada columna.
+SHARED_DATA = None  # AsyncContactManager común a todas las sesiones (se crea con la primera).
+SHARED_DATA_LOCK = threading.Lock()
+STARTUP_PENDING = True  # El informe de arranque se imprime solo para la primera sesión.
 
-    def footer(self):
-        self.set_y(-15)  # Posiciona el pie de página.
-        self.set_font('Arial', 'I', 8)  # Establece la fuente para el pie de página.
-        self.cell(0, 10, f'Página {self.page_no()}', 0, 0, 'C')  # Añade el número de página.
+# Función que devuelve el manejador de contactos de todo el proceso. Todas las sesiones usan la
+# misma conexión de escritura, el mismo grupo de lectores, la misma caché y el mismo ejecutor,
+# así la cantidad de conexiones e hilos no crece con cada ventana o pestaña abierta.
+def shared_data():
+    global SHARED_DATA
+    with SHARED_DATA_LOCK:
+        if SHARED_DATA is None:
+            SHARED_DATA = AsyncContactManager(CachedContactManager(ContactManager()))
+        return SHARED_DATA
 
 # Clase que define la interfaz de usuario del formulario.
 class FormUi(ft.UserControl):
     def __init__(self, page):
         super().__init__(expand=True)  # Llama al constructor de la clase base.
         self.page = page  # Guarda la referencia a la página.
-        self.data = ContactManager()  # Inicializa el manejador de contactos.
-        self.selected_row = None  # Almacena la fila seleccionada.
+        self.async_data = shared_data()  # Manejador compartido por todas las sesiones; lo usan los manejadores de eventos.
+        self.data = self.async_data.manager  # Versión síncrona (con caché) para importar y exportar.
+        self.selected_row = None  # Almacena la última fila seleccionada (la que se edita).
+        self.selected_ids = set()  # IDs de todas las filas marcadas (para borrar varias a la vez).
+        self.page_size = 50  # Cantidad máxima de filas que se muestran por página.
+        self.page_cursors = [(0, None)]  # (ID, valor ordenado) tras el cual empieza cada página visitada.
+        self.last_contact = None  # Último contacto de la página actual (cursor de la página siguiente).
+        self.sort_column = None  # Índice de la columna por la que se ordena (None: por ID).
+        self.sort_ascending = True  # Dirección del orden.
+        self.has_next_page = False  # Indica si existen más contactos después de la página actual.
+        self.row_index = {}  # ID del contacto -> fila de la tabla que lo muestra.
+        self.searching = False  # Indica si la tabla muestra resultados de búsqueda.
+        self.startup = None  # (inicio de la sesión, FormUi creado, página enviada) hasta mostrar los primeros datos.
+        # Buscador incremental: espera a que el usuario deje de escribir y cancela consultas obsoletas.
+        self.search_pipeline = SearchPipeline(
+            lambda search, cancelled: self.data.search(search, self.page_size, cancelled),
+            self.show_search_results,
+        )
 
         # Campos de entrada para los datos del contacto.
         self.name = ft.TextField(label="Nombre", border_color="pink")
@@ -34,16 +64,49 @@ class FormUi(ft.UserControl):
                                   input_filter=ft.NumbersOnlyInputFilter(),
                                   max_length=10)
 
-        # Campo de búsqueda para encontrar contactos por nombre.
+        # Campo de búsqueda para encontrar contactos por nombre, correo o teléfono.
         self.search_field = ft.TextField(  
                             suffix_icon=ft.icons.SEARCH,
-                            label="Buscar por el nombre",
+                            label="Buscar por nombre, correo o teléfono",
                             border=ft.InputBorder.UNDERLINE,
                             border_color="white",
                             label_style=ft.TextStyle(color="white"),
                             on_change=self.search_data,  
                         )
 
+        # Selector de archivos y estado de la importación masiva.
+        self.file_picker = ft.FilePicker(on_result=self.import_file)
+        self.page.overlay.append(self.file_picker)  # El selector debe vivir en la capa superior de la página.
+        self.import_status = ft.Text(color="white", visible=False)
+        self.import_progress = ft.ProgressBar(color="pink", visible=False)
+
+        # Estado de la exportación a PDF en segundo plano.
+        self.pdf_worker = None
+        self.export_status = ft.Text(color="white", visible=False)
+        self.export_progress = ft.ProgressBar(color="pink", value=0, visible=False)
+        self.cancel_export_button = ft.IconButton(tooltip="Cancelar exportación",
+                                                  icon=ft.icons.CANCEL,
+                                                  icon_color="white",
+                                                  visible=False,
+                                                  on_click=self.cancel_pdf,  # Acción para cancelar el PDF.
+                                                  )
+        # Interruptor de exportación por cambios: PDF y Excel solo llevan lo nuevo desde la exportación anterior.
+        self.delta_export = ft.Switch(label="Solo cambios", value=False, active_color="pink",
+                                      tooltip="Exportar solo los contactos nuevos, modificados o borrados desde la última exportación")
+
+        # Controles de paginación de la tabla.
+        self.page_label = ft.Text(color="white")
+        self.previous_button = ft.IconButton(tooltip="Página anterior",
+                                             icon=ft.icons.NAVIGATE_BEFORE,
+                                             icon_color="white",
+                                             on_click=self.previous_page,  # Acción para ir a la página anterior.
+                                             )
+        self.next_button = ft.IconButton(tooltip="Página siguiente",
+                                         icon=ft.icons.NAVIGATE_NEXT,
+                                         icon_color="white",
+                                         on_click=self.next_page,  # Acción para ir a la página siguiente.
+                                         )
+
         # Tabla para mostrar los datos de los contactos.
         self.data_table = ft.DataTable(
                             expand=True,
@@ -51,16 +114,17 @@ class FormUi(ft.UserControl):
                             data_row_color={ft.MaterialState.SELECTED: "pink", ft.MaterialState.PRESSED: "black"},
                             border_radius=10,
                             show_checkbox_column=True,
+                            on_select_all=self.select_all,  # Marca o desmarca todas las filas visibles.
                             columns=[  # Columnas de la tabla.
-                                ft.DataColumn(ft.Text("Nombre", color="pink", weight="bold")),
-                                ft.DataColumn(ft.Text("Edad", color="pink", weight="bold")),
-                                ft.DataColumn(ft.Text("Correo", color="pink", weight="bold"), numeric=True),
-                                ft.DataColumn(ft.Text("Teléfono", color="pink", weight="bold"), numeric=True),
+                                ft.DataColumn(ft.Text("Nombre", color="pink", weight="bold"), on_sort=self.sort_data),
+                                ft.DataColumn(ft.Text("Edad", color="pink", weight="bold"), on_sort=self.sort_data),
+                                ft.DataColumn(ft.Text("Correo", color="pink", weight="bold"), numeric=True,
+                                              on_sort=self.sort_data),
+                                ft.DataColumn(ft.Text("Teléfono", color="pink", weight="bold"), numeric=True,
+                                              on_sort=self.sort_data),
                             ],
                         )        
 
-        self.show_data()  # Muestra los datos existentes en la tabla.
-
         # Contenedor principal del formulario.
         self.form = ft.Container(
             bgcolor="#222222",
@@ -162,6 +226,20 @@ class FormUi(ft.UserControl):
                                         icon_color="white",
                                         on_click=self.save_excel,  # Acción para descargar en Excel.
                                         ),  
+                                ft.PopupMenuButton(tooltip="Descargar en Parquet o Arrow",
+                                        icon=ft.icons.DATASET,
+                                        items=[
+                                            ft.PopupMenuItem(text="Parquet", on_click=self.save_parquet),
+                                            ft.PopupMenuItem(text="Arrow IPC", on_click=self.save_arrow),
+                                        ],
+                                        ),
+                                self.delta_export,
+                                ft.IconButton(tooltip="Importar CSV, EXCEL, Parquet o Arrow",
+                                        icon=ft.icons.UPLOAD_FILE,
+                                        icon_color="white",
+                                        on_click=lambda _: self.file_picker.pick_files(
+                                            allowed_extensions=["csv", "xlsx", "parquet", "arrow"]),  # Acción para importar contactos.
+                                        ),
                             ]
                         ),
                     ),
@@ -171,7 +249,15 @@ class FormUi(ft.UserControl):
                         controls=[
                         ft.ResponsiveRow([self.data_table]),  # Muestra la tabla de datos.
                         ]
-                    )
+                    ),
+                    self.import_status,  # Avance de la importación.
+                    self.import_progress,
+                    ft.Row(controls=[self.export_status, self.cancel_export_button]),  # Avance del PDF.
+                    self.export_progress,
+                    ft.Row(
+                        alignment=ft.MainAxisAlignment.CENTER,
+                        controls=[self.previous_button, self.page_label, self.next_button],  # Paginación.
+                    ),
                 ]
             )
         )
@@ -181,64 +267,127 @@ class FormUi(ft.UserControl):
             controls=[self.form, self.table]
         )
     
-    # Método para mostrar los datos en la tabla.
-    def show_data(self):
+    # Método que devuelve los textos que se muestran de un contacto.
+    def cell_values(self, x):
+        return (
+            x.name,  # Nombre.
+            str(x.age),  # Edad.
+            x.email,  # Correo.
+            str(x.phone),  # Teléfono.
+        )
+
+    # Método para construir la fila de la tabla de un contacto.
+    def build_row(self, x):
+        row = ft.DataRow(
+            data=x.id,  # Guarda el ID del contacto en la fila.
+            on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
+            cells=[ft.DataCell(ft.Text(value)) for value in self.cell_values(x)],
+        )
+        self.row_index[x.id] = row  # Permite encontrar la fila por ID sin recorrer la tabla.
+        return row
+
+    # Métodos que modifican una sola fila de la tabla tras una escritura.
+    def insert_row(self, x):
+        # El contacto nuevo tiene el ID más alto: solo aparece si se está viendo la última página.
+        if self.searching or self.has_next_page or self.sort_column is not None:
+            return
+        if len(self.data_table.rows) < self.page_size:
+            self.data_table.rows.append(self.build_row(x))
+        else:
+            self.has_next_page = True  # No cabe: queda en una página nueva.
+            self.next_button.disabled = False
+
+    def replace_row(self, x):
+        row = self.row_index.get(x.id)
+        if row is not None:
+            for cell, value in zip(row.cells, self.cell_values(x)):
+                cell.content.value = value  # Cambia solo los textos de la fila.
+
+    def remove_row(self, contact_id):
+        row = self.row_index.pop(contact_id, None)
+        if row is not None:
+            self.data_table.rows.remove(row)
+
+    # Muestra los datos existentes en la tabla cuando el control ya está en la página.
+    def did_mount(self):
+        if self.startup is not None:
+            self.startup += (time.perf_counter(),)  # Página enviada: empieza la carga de datos.
+        self.page.run_task(self.show_data)
+
+    # Método para mostrar la página actual de datos en la tabla.
+    async def show_data(self):
+        # Pide una fila extra para saber si hay una página siguiente; la base de datos ordena y corta la página.
+        after_id, after_value = self.page_cursors[-1]
+        order_by = "ID" if self.sort_column is None else SORT_FIELDS[self.sort_column]
+        contacts = await self.async_data.list_contacts(after_id, self.page_size + 1, order_by,
+                                                       not self.sort_ascending, after_value)
+        if not contacts and len(self.page_cursors) > 1:
+            self.page_cursors.pop()  # La página quedó vacía (p. ej. tras borrar), vuelve a la anterior.
+            return await self.show_data()
         self.data_table.rows = []  # Limpia las filas actuales.
-        for x in self.data.get_contacts():  # Obtiene todos los contactos.
-            self.data_table.rows.append(
-                ft.DataRow(
-                    on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
-                    cells=[
-                        ft.DataCell(ft.Text(x[1])),  # Nombre.
-                        ft.DataCell(ft.Text(str(x[2]))),  # Edad.
-                        ft.DataCell(ft.Text(x[3])),  # Correo.
-                        ft.DataCell(ft.Text(str(x[4]))),  # Teléfono.
-                    ]
-                )
-            )
+        self.row_index = {}
+        self.selected_ids = set()
+        self.searching = False
+        self.has_next_page = len(contacts) > self.page_size
+        self.last_contact = contacts[self.page_size - 1] if self.has_next_page else None
+        for x in contacts[:self.page_size]:  # Solo construye las filas de la página actual.
+            self.data_table.rows.append(self.build_row(x))
+        self.page_label.value = f"Página {len(self.page_cursors)}"  # Número de la página actual.
+        self.previous_button.disabled = len(self.page_cursors) == 1
+        self.next_button.disabled = not self.has_next_page
         self.update()  # Actualiza la interfaz.
+        if self.startup is not None:
+            print_startup_report(*self.startup, time.perf_counter())  # La primera pintura incluye la tabla con datos.
+            self.startup = None
 
-# MANEJO DE ERRORES
-    def add_data(self, e):
-        name = self.name.value
-        age = str(self.age.value)
-        email = self.email.value
-        phone = str(self.phone.value)
-
-        # Validar campos vacíos  
-        if not name or not age or not email or not phone:
-            self.show_error_modal("Falta rellenar campos.")
-            return
-        
-        # Validar el nombre (solo letras y espacios).
-        if not re.match("^[A-Za-záéíóúÁÉÍÓÚñÑ\\s]+$", name):
+    # Método para avanzar a la página siguiente.
+    async def next_page(self, e):
+        if self.has_next_page and self.last_contact is not None:
+            # La página empieza tras el último contacto mostrado (su ID y el valor de la columna ordenada).
+            x = self.last_contact
+            self.page_cursors.append((x.id, None if self.sort_column is None else getattr(x, SORT_ATTRIBUTES[self.sort_column])))
+            await self.show_data()
 
-            self.show_error_modal("El nombre solo debe contener letras y espacios.")
-            return
+    # Método para ordenar la tabla por la columna pulsada; vuelve a la primera página.
+    async def sort_data(self, e):
+        self.sort_column = e.column_index
+        self.sort_ascending = e.ascending
+        self.data_table.sort_column_index = e.column_index  # Muestra la flecha en la columna.
+        self.data_table.sort_ascending = e.ascending
+        self.page_cursors = [(0, None)]
+        if self.searching:
+            self.search_pipeline.cancel()  # El orden se aplica a la lista completa, no a una búsqueda.
+            self.search_field.value = ""
+        await self.show_data()
 
-        # Validar el correo (simple validación).
-        if not "@" in email or not "." in email:
-            self.show_error_modal("El correo no es válido.")
+    # Método para volver a la página anterior.
+    async def previous_page(self, e):
+        if len(self.page_cursors) > 1:
+            self.page_cursors.pop()  # Descarta el inicio de la página actual.
+            await self.show_data()
+
+# MANEJO DE ERRORES
+    async def add_data(self, e):
+        # Valida los campos con las mismas reglas que la importación y la API.
+        contact, error = validate_contact(self.name.value, self.age.value, self.email.value, self.phone.value)
+        if error:
+            self.show_error_modal(error)
             return
-        
-        # Comprobar si el contacto ya existe.
-        contact_exists = False
-        for row in self.data.get_contacts():
-            if row[1] == name:
-                contact_exists = True
-                break
-
-        if not contact_exists:
+        name, age, email, phone = contact
+
+        # Comprobar si el contacto ya existe (consulta indexada por nombre).
+        if not await self.async_data.exists(name):
             self.clean_fields()  # Limpia los campos tras agregar.
-            self.data.add_contact(name, age, email, phone)  # Añade el nuevo contacto.
-            self.show_data()  # Muestra los datos actualizados.
+            contact = await self.async_data.add_contact(name, age, email, phone)  # Añade el nuevo contacto.
+            self.insert_row(contact)  # Agrega solo la fila nueva.
+            self.update()
         else:
             self.show_error_modal("El contacto ya existe en la base de datos.")  # Muestra error si el contacto existe.
 
-    # Método para mostrar un modal de error.
-    def show_error_modal(self, message):
+    # Método para mostrar un modal de error (o de información, cambiando el título).
+    def show_error_modal(self, message, title="Error"):
         modal = ft.AlertDialog(
-            title=ft.Text("Error"),
+            title=ft.Text(title),
             content=ft.Text(message),
             actions=[
                 ft.TextButton("Cerrar", on_click=lambda e: self.close_modal(modal))  # Botón para cerrar el modal.
@@ -252,77 +401,90 @@ class FormUi(ft.UserControl):
         modal.open = False  # Cierra el modal.
         self.page.update()
 
-    def get_index(self, e):
-        if e.control.selected:  # Cambia el estado de selección de la fila.
-           e.control.selected = False
-        else: 
-            e.control.selected = True
-        name = e.control.cells[0].content.value  # Obtiene el nombre de la fila seleccionada.
-        for row in self.data.get_contacts():
-            if row[1] == name:
-                self.selected_row = row  # Guarda la fila seleccionada.
-                break
+    async def get_index(self, e):
+        e.control.selected = not e.control.selected  # Cambia el estado de selección de la fila.
+        if e.control.selected:
+            self.selected_ids.add(e.control.data)
+            self.selected_row = await self.async_data.get_contact_by_id(e.control.data)  # Busca la fila seleccionada por su ID.
+        else:
+            self.selected_ids.discard(e.control.data)
+            if self.selected_row is not None and self.selected_row.id == e.control.data:
+                self.selected_row = None
+        self.update()
+
+    def select_all(self, e):
+        selected = e.data == "true"  # Flet envía "true" o "false".
+        for row in self.data_table.rows:
+            row.selected = selected
+        self.selected_ids = {row.data for row in self.data_table.rows} if selected else set()
+        if not selected:
+            self.selected_row = None
         self.update()
 
     def edit_field_text(self, e):  
         try: 
             # Rellena los campos con los datos de la fila seleccionada.
-            self.name.value = self.selected_row[1]
-            self.age.value = self.selected_row[2]
-            self.email.value = self.selected_row[3]
-            self.phone.value = self.selected_row[4]   
+            self.name.value = self.selected_row.name
+            self.age.value = self.selected_row.age
+            self.email.value = self.selected_row.email
+            self.phone.value = self.selected_row.phone
             self.update()
-        except TypeError:
+        except AttributeError:
             print("Error")  # Manejo de error si no se seleccionó ninguna fila.
 
 # ACTUALIZAR DATOS
-    def update_data(self, e):
+    async def update_data(self, e):
         if not self.selected_row:
             self.show_error_modal("No ha seleccionado ningún registro.")  # Error si no hay fila seleccionada.
             return
 
-        name = self.name.value
-        age = str(self.age.value)
-        email = self.email.value
-        phone = str(self.phone.value)
-
-        # Verifica que los campos no estén vacíos.
-        if len(name) and len(age) and len(email) and len(phone) > 0:
-            self.clean_fields()  # Limpia los campos tras actualizar.
-            self.data.update_contact(self.selected_row[0], name, age, email, phone)  # Actualiza el contacto.
-            self.show_data()  # Muestra los datos actualizados.
+        # Valida los campos con las mismas reglas que al agregar.
+        contact, error = validate_contact(self.name.value, self.age.value, self.email.value, self.phone.value)
+        if error:
+            self.show_error_modal(error)
+            return
+        name, age, email, phone = contact
+        self.clean_fields()  # Limpia los campos tras actualizar.
+        contact = await self.async_data.update_contact(self.selected_row.id, name, age, email, phone)  # Actualiza el contacto.
+        if contact is not None:
+            self.selected_row = contact
+            self.replace_row(contact)  # Cambia solo la fila editada.
+        self.update()
 
 # BORRAR DATOS
-    def delete_data(self, e):
-        if not self.selected_row:
+    async def delete_data(self, e):
+        if not self.selected_ids:
             self.show_error_modal("No ha seleccionado ningún registro.")  # Error si no hay fila seleccionada.
             return
 
-        self.data.delete_contact(self.selected_row[1])  # Elimina el contacto seleccionado.
-        self.show_data()  # Muestra los datos actualizados.
+        # Borra todas las filas marcadas por ID en una sola transacción.
+        for contact in await self.async_data.delete_contacts(list(self.selected_ids)):
+            self.remove_row(contact.id)  # Quita solo las filas borradas.
+        self.selected_ids = set()
+        self.selected_row = None
+        if not self.data_table.rows and not self.searching:
+            await self.show_data()  # Se borró la página entera: carga la que corresponda.
+        else:
+            self.update()  # Una sola actualización de la tabla.
 
 # BÚSQUEDA
-    def search_data(self, e):  
-        search = self.search_field.value.lower()  # Obtiene el término de búsqueda.
-        name = list(filter(lambda x: search in x[1].lower(), self.data.get_contacts()))  # Filtra contactos.
-        self.data_table.rows = []  # Limpia la tabla.
-        if not self.search_field.value == "": 
-            if len(name) > 0:
-                for x in name:
-                    self.data_table.rows.append(
-                        ft.DataRow(
-                            on_select_changed=self.get_index,  # Llama a get_index al seleccionar una fila.
-                            cells=[
-                                ft.DataCell(ft.Text(x[1])),  # Nombre.
-                                ft.DataCell(ft.Text(str(x[2]))),  # Edad.
-                                ft.DataCell(ft.Text(x[3])),  # Correo.
-                                ft.DataCell(ft.Text(str(x[4]))),  # Teléfono.
-                            ]
-                        )
-                    )
-                    self.update()
+    async def search_data(self, e):  
+        if self.search_field.value.strip() == "":
+            self.search_pipeline.cancel()  # Descarta búsquedas pendientes.
+            await self.show_data()  # Si no hay búsqueda, muestra todos los datos.
         else:
-            self.show_data()  # Si no hay búsqueda, muestra todos los datos.
+            self.search_pipeline.submit(self.search_field.value)  # Busca cuando el usuario deja de escribir.
+
+    # Método que pinta de una sola vez los resultados entregados por el buscador.
+    def show_search_results(self, search, contacts):
+        self.row_index = {}
+        self.selected_ids = set()
+        self.searching = True
+        self.data_table.rows = [self.build_row(x) for x in contacts]  # Sustituye las filas de la tabla.
+        self.page_label.value = f"{len(contacts)} resultado(s)"
+        self.previous_button.disabled = True  # La paginación no aplica a los resultados.
+        self.next_button.disabled = True
+        self.update()  # Una sola actualización para todo el resultado.
 
 # LIMPIAR CAMPOS
     def clean_fields(self, e=None):
@@ -332,42 +494,152 @@ class FormUi(ft.UserControl):
         self.phone.value = ""  # Limpia el campo de teléfono.      
         self.update()  # Actualiza la interfaz.
 
+# IMPORTACIÓN MASIVA
+    def import_file(self, e):
+        if not e.files:
+            return  # El usuario cerró el selector sin elegir archivo.
+        self.import_status.value = "Importando..."
+        self.import_status.visible = True
+        self.import_progress.visible = True
+        self.update()
+        # La lectura y la inserción se hacen en otro hilo para no congelar la interfaz.
+        threading.Thread(target=self.run_import, args=(e.files[0].path,), daemon=True).start()
+
+    def run_import(self, path):
+        try:
+            report = importer.import_file(self.data, path, on_progress=self.show_import_progress)
+        except Exception as error:  # Archivo ilegible, formato no soportado, etc.
+            report = None
+            message = f"No se pudo importar el archivo: {error}"
+        self.import_status.visible = False
+        self.import_progress.visible = False
+        self.page.run_task(self.show_data)  # Muestra los datos actualizados desde el bucle de eventos.
+        if report is None:
+            self.show_error_modal(message)
+            return
+        message = f"Se importaron {report.imported} contactos. Filas con errores: {report.error_count}."
+        for line, error in report.errors[:10]:  # Muestra solo los primeros errores.
+            message += f"\nFila {line}: {error}"
+        self.show_error_modal(message, title="Importación terminada")
+
+    def show_import_progress(self, imported):
+        self.import_status.value = f"Importando... {imported} contactos"
+        self.update()
+
 # APARTADO DE DESCARGA PARA PDF 
     def save_pdf(self, e):
-        pdf = PDF()  # Crea una nueva instancia de PDF.
-        pdf.add_page()  # Añade una página al PDF.
-        column_widths = [10, 40, 20, 80, 40]  # Define el ancho de las columnas.
-        # Agrega filas a la tabla.
-        data = self.data.get_contacts()  # Obtiene todos los contactos.
-        header = ("ID", "NOMBRE", "EDAD", "CORREO", "TELÉFONO")  # Define el encabezado.
-        data.insert(0, header)  # Inserta el encabezado en los datos.
-        for row in data:  # Añade cada fila al PDF.
-            for item, width in zip(row, column_widths):
-                pdf.cell(width, 10, str(item), border=1)  # Escribe cada celda.
-            pdf.ln()  # Salto de línea para la siguiente fila.
+        if self.pdf_worker is not None and self.pdf_worker.is_alive():
+            return  # Ya hay una exportación en curso.
         file_name = datetime.datetime.now()  # Crea un nombre de archivo basado en la fecha y hora.
-        file_name = file_name.strftime("DATA %Y-%m-%d_%H-%M-%S") + ".pdf"  # Formato del nombre.
-        pdf.output(file_name)  # Guarda el PDF.
+        file_name = file_name.strftime("DATA %Y-%m-%d_%H-%M-%S") + self.export_suffix() + ".pdf"  # Formato del nombre.
+        self.export_status.value = "Generando PDF..."
+        self.export_progress.value = 0
+        self.export_status.visible = True
+        self.export_progress.visible = True
+        self.cancel_export_button.visible = True
+        self.update()
+        from pdf_export import PdfExportWorker  # Se importa solo cuando se necesita.
+        # El PDF se genera en otro hilo, leyendo los contactos por bloques.
+        self.pdf_worker = PdfExportWorker(self.data, file_name,
+                                          on_progress=self.show_pdf_progress,
+                                          on_finish=self.finish_pdf,
+                                          delta=self.delta_export.value)
+        self.pdf_worker.start()
+
+    def show_pdf_progress(self, written, total):
+        self.export_progress.value = written / total if total else 1  # Fracción completada.
+        self.export_status.value = f"Generando PDF... {written}/{total}"
+        self.update()
+
+    def cancel_pdf(self, e):
+        if self.pdf_worker is not None:
+            self.pdf_worker.cancel()  # El hilo se detiene al terminar el bloque actual.
+
+    def finish_pdf(self, worker):
+        self.export_status.visible = False
+        self.export_progress.visible = False
+        self.cancel_export_button.visible = False
+        self.update()
+        if worker.error is not None:
+            self.show_error_modal(f"No se pudo generar el PDF: {worker.error}")
+        elif not worker.cancelled():
+            self.show_error_modal(f"Se guardó {worker.file_name}{self.export_details(worker.summary)}",
+                                  title="Exportación terminada")
+
+    # Métodos comunes a las exportaciones.
+    def export_suffix(self):
+        return " cambios" if self.delta_export.value else ""  # Distingue los archivos de cambios.
+
+    def export_details(self, summary):
+        if not summary["delta"]:
+            if self.delta_export.value:
+                return " (completa: no hay una exportación anterior desde la que calcular los cambios)"
+            return ""
+        return f" ({summary['rows']} nuevos o modificados, {summary['deleted']} eliminados)"
 
 # APARTADO DE DESCARGA PARA EXCEL
     def save_excel(self, e):
         file_name = datetime.datetime.now()  # Crea un nombre de archivo basado en la fecha y hora.
-        file_name = file_name.strftime("DATA %Y-%m-%d_%H-%M-%S") + ".xlsx"  # Formato del nombre.
-        contacts = self.data.get_contacts()  # Obtiene todos los contactos.
-        df = pd.DataFrame(contacts, columns=["ID", "Nombre", "Edad", "Correo", "Teléfono"])  # Crea un DataFrame.
-        df.to_excel(file_name, index=False)  # Guarda el DataFrame como archivo Excel.
+        file_name = file_name.strftime("DATA %Y-%m-%d_%H-%M-%S") + self.export_suffix() + ".xlsx"  # Formato del nombre.
+        summary = exporter.export_excel(self.data, file_name, delta=self.delta_export.value)  # Escribe los contactos por bloques.
+        if self.delta_export.value:
+            self.show_error_modal(f"Se guardó {file_name}{self.export_details(summary)}", title="Exportación terminada")
+
+# APARTADO DE DESCARGA EN FORMATOS COLUMNARES (Parquet y Arrow, con la edad como entero)
+    def save_parquet(self, e):
+        self.save_columnar(".parquet", exporter.export_parquet)
+
+    def save_arrow(self, e):
+        self.save_columnar(".arrow", exporter.export_arrow)
+
+    def save_columnar(self, extension, export):
+        file_name = datetime.datetime.now().strftime("DATA %Y-%m-%d_%H-%M-%S") + extension
+        try:
+            written = export(self.data, file_name)  # Lee y escribe por bloques.
+        except ImportError:
+            self.show_error_modal("Para exportar en este formato hace falta instalar pyarrow.")
+            return
+        self.show_error_modal(f"Se guardó {file_name} ({written} contactos)", title="Exportación terminada")
 
     def build(self):
         return self.content
 
+    def close(self):
+        # Método que libera lo propio de la sesión al desconectarse: la búsqueda pendiente y el PDF en curso.
+        # El manejador de contactos es compartido y sigue abierto para las demás sesiones.
+        self.search_pipeline.cancel()
+        if self.pdf_worker is not None:
+            self.pdf_worker.cancel()
+
+# Función que imprime cuánto tardó cada etapa del arranque, en milisegundos.
+def print_startup_report(session_started, built, sent, painted):
+    print("Arranque:")
+    print(f"  importaciones      {(IMPORTED - STARTED) * 1000:8.1f} ms")
+    print(f"  conexión de Flet   {(session_started - IMPORTED) * 1000:8.1f} ms")
+    print(f"  creación de FormUi {(built - session_started) * 1000:8.1f} ms")
+    print(f"  envío de la página {(sent - built) * 1000:8.1f} ms")
+    print(f"  carga de datos     {(painted - sent) * 1000:8.1f} ms")
+    print(f"  primera pintura    {(painted - STARTED) * 1000:8.1f} ms")
+
 # Función principal que inicializa la aplicación.
 def main(page: ft.Page):
+    session_started = time.perf_counter()  # Momento en que Flet abrió la sesión.
     page.bgcolor = "black"  # Establece el color de fondo de la página.
     page.title = "CRUD SQLite"  # Título de la ventana.
     page.window_min_width = 1100  # Ancho mínimo de la ventana.
     page.window_min_height = 500  # Altura mínima de la ventana.
-    form_ui = FormUi(page)  # Crea una instancia de la interfaz de usuario.
-    form_ui.data.close_connection()  # Cierra la conexión a la base de datos.
-    page.add(FormUi(page))  # Agrega la interfaz a la página.
+    form_ui = FormUi(page)  # Crea una única instancia de la interfaz de usuario.
+    built = time.perf_counter()
+    global STARTUP_PENDING
+    if STARTUP_PENDING:
+        # Solo la primera sesión mide el arranque: en las siguientes, el tiempo desde STARTED es
+        # el que lleva abierto el proceso, no lo que tardó la sesión.
+        STARTUP_PENDING = False
+        form_ui.startup = (session_started, built)  # El informe se imprime al terminar el primer show_data.
+    page.add(form_ui)  # Agrega la interfaz a la página.
+    page.on_disconnect = lambda e: form_ui.close()  # Libera los recursos de la sesión al cerrarse.
 
-ft.app(main)  # Ejecuta la aplicación.
+if __name__ == "__main__":
+    ft.app(main)  # Ejecuta la aplicación.
+    if SHARED_DATA is not None:
+        SHARED_DATA.close()  # Cierra las conexiones compartidas al terminar.
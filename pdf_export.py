@@ -0,0 +1,229 @@
+import itertools  # Importa itertools para calcular la primera página de cada bloque.
+import math  # Importa math para repartir las páginas entre procesos.
+import multiprocessing  # Importa multiprocessing para elegir cómo se crean los procesos.
+import os  # Importa os para contar los núcleos y construir rutas.
+import shutil  # Importa shutil para borrar los bloques temporales.
+import sqlite3  # Importa sqlite3 para que cada proceso abra su propia conexión.
+import tempfile  # Importa tempfile para los bloques de páginas.
+import threading  # Importa threading para generar el PDF sin bloquear la interfaz.
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Importa el grupo de procesos.
+from fpdf import FPDF  # Importa FPDF para la generación de PDFs.
+import exporter  # Importa el cálculo de exportaciones completas o por cambios.
+from contact_manager import select_id_range  # Importa la lectura de un rango de IDs.
+from storage import read_only_uri  # Importa la URI de solo lectura de la base de datos.
+
+# Columnas de la tabla del PDF con su ancho.
+COLUMNS = (("ID", 10), ("NOMBRE", 40), ("EDAD", 20), ("CORREO", 80), ("TELÉFONO", 40))
+DELETED_COLUMNS = (("ID ELIMINADO", 40),)  # Tabla de contactos borrados de una exportación por cambios.
+PARALLEL_MIN_ROWS = 20000  # A partir de aquí (con varios núcleos) el PDF completo se genera en paralelo.
+MIN_BLOCK_PAGES = 20  # Páginas mínimas por bloque: bloques más chicos cuestan más en procesos que en páginas.
+
+# Clase que define el encabezado y pie de página de un PDF.
+class PDF(FPDF):
+    columns = ()  # Encabezado de tabla que se repite en cada página.
+    page_offset = 0  # Páginas que van antes de este documento (bloques de la exportación paralela).
+
+    def header(self):
+        self.set_font('Arial', 'B', 12)  # Establece la fuente para el encabezado.
+        self.cell(0, 10, 'Tabla de Datos', 0, 1, 'C')  # Añade el título en el centro.
+        if self.columns:
+            for title, width in self.columns:  # Repite la fila de encabezado de la tabla.
+                self.cell(width, 10, title, border=1)
+            self.ln()
+
+    def footer(self):
+        self.set_y(-15)  # Posiciona el pie de página.
+        self.set_font('Arial', 'I', 8)  # Establece la fuente para el pie de página.
+        self.cell(0, 10, f'Página {self.page_no() + self.page_offset}', 0, 0, 'C')  # Añade el número de página.
+
+# Función que escribe filas de contactos en la tabla del PDF.
+def write_rows(pdf, rows):
+    for row in rows:
+        for item, (title, width) in zip(row, pdf.columns or COLUMNS):
+            pdf.cell(width, 10, str(item), border=1)  # Escribe cada celda.
+        pdf.ln()  # Salto de línea para la siguiente fila.
+
+# Función que calcula cuántas filas de contactos caben en una página.
+def rows_per_page():
+    global ROWS_PER_PAGE
+    if ROWS_PER_PAGE is None:
+        pdf = PDF()
+        pdf.columns = COLUMNS
+        pdf.add_page()
+        rows = 0
+        while pdf.page_no() == 1:  # Escribe filas hasta que una pasa a la página siguiente.
+            write_rows(pdf, [("",) * len(COLUMNS)])
+            rows += 1
+        ROWS_PER_PAGE = rows - 1
+    return ROWS_PER_PAGE
+
+ROWS_PER_PAGE = None  # Se calcula la primera vez que se usa.
+
+# Función que genera en un proceso aparte las páginas de los contactos con first_id <= ID < next_id.
+# Numera las páginas a partir de page_offset + 1 y devuelve (filas escritas, páginas).
+def render_block(db_path, first_id, next_id, page_offset, file_name, chunk_size=500):
+    connection = sqlite3.connect(read_only_uri(db_path), uri=True)  # Conexión propia del proceso.
+    try:
+        cursor = select_id_range(connection, first_id, next_id)
+        pdf = PDF()
+        pdf.columns = COLUMNS
+        pdf.page_offset = page_offset
+        pdf.add_page()
+        rows = 0
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            write_rows(pdf, chunk)
+            rows += len(chunk)
+        pdf.output(file_name)
+        return rows, pdf.page_no()
+    finally:
+        connection.close()
+
+# Función que une los bloques de páginas, en orden, en un solo PDF.
+def merge_blocks(files, file_name):
+    from pypdf import PdfWriter  # Se importa solo cuando se necesita.
+    writer = PdfWriter()
+    for block in files:
+        writer.append(block)
+    with open(file_name, "wb") as file:
+        writer.write(file)
+
+# Hilo que genera el PDF leyendo los contactos por bloques; se puede cancelar.
+# Con delta=True solo incluye los contactos nuevos o cambiados desde la última exportación
+# a 'target', seguidos de los IDs borrados.
+# Las exportaciones completas grandes se reparten por rangos de ID entre varios procesos: cada uno
+# genera un bloque de páginas enteras y al final se unen (requiere pypdf). parallel=None lo decide
+# según el tamaño de la tabla y los núcleos; True o False lo fuerzan.
+class PdfExportWorker(threading.Thread):
+    def __init__(self, manager, file_name, on_progress=None, on_finish=None, chunk_size=500,
+                 delta=False, target="pdf", parallel=None, processes=None):
+        super().__init__(daemon=True)
+        self.manager = manager  # Manejador de contactos del que se leen los datos.
+        self.file_name = file_name  # Archivo de salida.
+        self.on_progress = on_progress  # on_progress(escritos, total).
+        self.on_finish = on_finish  # on_finish(worker) al terminar, cancelar o fallar.
+        self.chunk_size = chunk_size  # Filas leídas por bloque.
+        self.cancel_event = threading.Event()
+        self.delta = delta  # Exportación solo de los cambios.
+        self.target = target  # Nombre con el que se guarda hasta dónde llegó la exportación.
+        self.parallel = parallel  # Generación en varios procesos (None: automática).
+        self.processes = processes or os.cpu_count() or 1  # Procesos de la exportación paralela.
+        self.summary = None  # Resumen al terminar: {"delta", "rows", "deleted"}.
+        self.error = None  # Excepción, si la generación falló.
+
+    def cancel(self):
+        # Método para pedir la cancelación; el hilo se detiene al terminar el bloque actual.
+        self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def run(self):
+        try:
+            since_seq, until_seq = exporter.plan_export(self.manager, self.target, self.delta)
+            deleted = []
+            if since_seq is None:
+                total = self.manager.count_contacts()
+                if self.use_parallel(total):
+                    written = self.run_parallel(total)
+                    if written is not None:
+                        exporter.finish_export(self.manager, self.target, until_seq)
+                        self.summary = {"delta": False, "rows": written, "deleted": 0}
+                    return
+                chunks = self.manager.iter_contacts(self.chunk_size)
+            else:
+                total = self.manager.count_delta(since_seq, until_seq)
+                chunks = exporter.iter_delta_rows(self.manager, since_seq, until_seq, deleted, self.chunk_size)
+            pdf = PDF()  # Crea una nueva instancia de PDF.
+            pdf.columns = COLUMNS
+            pdf.add_page()  # Añade una página al PDF.
+            written = 0
+            read = 0  # Contactos leídos (escritos o borrados), para el avance.
+            for chunk in chunks:
+                if self.cancelled():
+                    return  # No se guarda ningún archivo.
+                write_rows(pdf, chunk)
+                written += len(chunk)
+                read = written + len(deleted)
+                if self.on_progress is not None:
+                    self.on_progress(read, max(total, read))
+            if deleted:
+                pdf.columns = DELETED_COLUMNS
+                pdf.add_page()
+                write_rows(pdf, ((contact_id,) for contact_id in deleted))
+            pdf.output(self.file_name)  # Guarda el PDF.
+            exporter.finish_export(self.manager, self.target, until_seq)
+            self.summary = {"delta": since_seq is not None, "rows": written, "deleted": len(deleted)}
+        except Exception as error:
+            self.error = error
+        finally:
+            if self.on_finish is not None:
+                self.on_finish(self)
+
+    def use_parallel(self, total):
+        # Método que decide si la exportación completa se genera en varios procesos.
+        if self.parallel is not None:
+            return self.parallel
+        if self.processes < 2 or total < PARALLEL_MIN_ROWS:
+            return False
+        try:
+            import pypdf  # Hace falta para unir los bloques.
+        except ImportError:
+            return False
+        return True
+
+    def render_blocks(self, pool, blocks, folder, total, written):
+        # Método que genera los bloques indicados en el grupo de procesos.
+        # 'blocks' es una lista de (índice, primer ID, ID siguiente, primera página - 1).
+        # Devuelve {índice: (filas, páginas)} o None si se canceló.
+        db_path = self.manager.storage.db_path
+        futures = {pool.submit(render_block, db_path, first_id, next_id, offset,
+                               os.path.join(folder, f"{index}.pdf"), self.chunk_size): index
+                   for index, first_id, next_id, offset in blocks}
+        results = {}
+        for future in as_completed(futures):
+            if self.cancelled():
+                pool.shutdown(wait=True, cancel_futures=True)
+                return None
+            results[futures[future]] = future.result()
+            written[0] += results[futures[future]][0]
+            if self.on_progress is not None:
+                self.on_progress(written[0], max(total, written[0]))
+        return results
+
+    def run_parallel(self, total):
+        # Método que genera el PDF completo en varios procesos. Devuelve las filas escritas o None si se canceló.
+        pages_per_block = max(MIN_BLOCK_PAGES, math.ceil(total / rows_per_page() / (self.processes * 4)))
+        # Cada bloque tiene un número entero de páginas, así los bloques unidos quedan igual que el PDF en serie.
+        starts = self.manager.block_starts(rows_per_page() * pages_per_block)
+        ranges = list(zip(starts, starts[1:] + [None]))
+        folder = tempfile.mkdtemp(prefix="contactos-pdf-")
+        try:
+            # 'spawn' crea procesos nuevos en vez de copiar este, que tiene otros hilos en marcha (Flet, escritor).
+            with ProcessPoolExecutor(max_workers=min(self.processes, len(ranges) or 1),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                written = [0]
+                blocks = [(index, first_id, next_id, index * pages_per_block)
+                          for index, (first_id, next_id) in enumerate(ranges)]
+                results = self.render_blocks(pool, blocks, folder, total, written)
+                if results is None:
+                    return None
+                # Si la tabla cambió durante la exportación algún bloque puede tener otra cantidad de
+                # páginas: se regeneran los bloques cuya numeración quedó corrida.
+                offsets = list(itertools.accumulate([0] + [results[index][1] for index in range(len(ranges) - 1)]))
+                moved = [(index, first_id, next_id, offsets[index])
+                         for index, first_id, next_id, offset in blocks if offsets[index] != offset]
+                if moved:
+                    rendered = self.render_blocks(pool, moved, folder, total, written)
+                    if rendered is None:
+                        return None
+                    results.update(rendered)
+            if ranges:
+                merge_blocks([os.path.join(folder, f"{index}.pdf") for index in range(len(ranges))], self.file_name)
+            else:
+                render_block(self.manager.storage.db_path, 0, None, 0, self.file_name)  # Tabla vacía.
+            return sum(rows for rows, pages in results.values())
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,49 @@
+import sqlite3  # Importa sqlite3 para reconocer las consultas interrumpidas.
+import threading  # Importa threading para el temporizador de espera y el bloqueo.
+
+# Clase que agrupa las pulsaciones del buscador: espera a que el usuario deje de escribir,
+# cancela las búsquedas que quedaron obsoletas y entrega cada resultado una sola vez.
+class SearchPipeline:
+    def __init__(self, search, on_results, delay=0.25):
+        self.search = search  # Función search(query, cancelled) que consulta la base de datos.
+        self.on_results = on_results  # Función on_results(query, contacts) que pinta los resultados.
+        self.delay = delay  # Segundos de espera desde la última pulsación.
+        self.generation = 0  # Número de la búsqueda más reciente.
+        self.timer = None  # Temporizador pendiente, si lo hay.
+        self.lock = threading.Lock()  # Protege generation y timer entre hilos.
+
+    def submit(self, query):
+        # Método para registrar una nueva pulsación; reinicia la espera y deja obsoleta la anterior.
+        with self.lock:
+            self.generation += 1
+            if self.timer is not None:
+                self.timer.cancel()  # Descarta la búsqueda que todavía no había empezado.
+            self.timer = threading.Timer(self.delay, self.run, args=(self.generation, query))
+            self.timer.daemon = True
+            self.timer.start()
+
+    def cancel(self):
+        # Método para cancelar cualquier búsqueda pendiente o en curso.
+        with self.lock:
+            self.generation += 1
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+    def is_stale(self, generation):
+        # Una búsqueda queda obsoleta en cuanto llega una pulsación más nueva.
+        return generation != self.generation
+
+    def run(self, generation, query):
+        # Método que ejecuta la búsqueda en el hilo del temporizador.
+        if self.is_stale(generation):
+            return
+        try:
+            # La consulta se interrumpe en SQLite si llega otra pulsación mientras se ejecuta.
+            contacts = self.search(query, lambda: self.is_stale(generation))
+        except sqlite3.OperationalError:
+            if self.is_stale(generation):
+                return  # Consulta interrumpida a propósito.
+            raise
+        if not self.is_stale(generation):
+            self.on_results(query, contacts)  # Entrega el resultado completo de una sola vez.
@@ -0,0 +1,92 @@
+import pathlib  # Importa pathlib para construir la URI de solo lectura.
+import queue  # Importa queue para el grupo de conexiones de lectura.
+import sqlite3  # Importa el módulo sqlite3 para trabajar con bases de datos SQLite.
+import threading  # Importa threading para proteger la conexión de escritura.
+from contextlib import contextmanager  # Importa contextmanager para prestar conexiones con 'with'.
+from instrumentation import InstrumentedConnection  # Importa la conexión que mide cada sentencia.
+
+# Función que devuelve la URI para abrir el archivo en modo solo lectura.
+def read_only_uri(db_path):
+    return pathlib.Path(db_path).resolve().as_uri() + "?mode=ro"
+
+# Clase que reparte las conexiones a la base de datos entre hilos y sesiones:
+# una sola conexión de escritura y un grupo limitado de conexiones de solo lectura.
+# En modo WAL los lectores no esperan al escritor ni el escritor a los lectores.
+class Storage:
+    def __init__(self, db_path="data.db", readers=4, busy_timeout=5000, monitor=None):
+        self.db_path = db_path  # Ruta del archivo de base de datos.
+        self.busy_timeout = busy_timeout  # Milisegundos que se espera a un bloqueo antes de fallar.
+        self.monitor = monitor  # QueryMonitor que recibe las métricas de todas las conexiones (o None).
+        self.writer = self.connect(db_path)  # Única conexión de escritura.
+        self.writer.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+        self.writer.execute("PRAGMA journal_mode = WAL")  # Lectores y escritor concurrentes.
+        self.write_lock = threading.RLock()  # Un solo hilo escribe a la vez.
+        self.max_readers = readers  # Máximo de conexiones de lectura abiertas.
+        self.readers = queue.LifoQueue()  # Conexiones de lectura libres.
+        self.opened_readers = []  # Todas las conexiones de lectura abiertas.
+        self.readers_lock = threading.Lock()  # Protege la apertura de nuevas conexiones de lectura.
+        self.watcher = None  # Conexión que solo observa los commits (ver change_version).
+        self.watcher_lock = threading.Lock()
+
+    def connect(self, database, uri=False):
+        # Abre una conexión; si hay monitor, sus sentencias y commits quedan medidos.
+        if self.monitor is None:
+            return sqlite3.connect(database, uri=uri, check_same_thread=False)
+        connection = sqlite3.connect(database, uri=uri, check_same_thread=False, factory=InstrumentedConnection)
+        connection.monitor = self.monitor
+        return connection
+
+    def open_reader(self):
+        # Abre una conexión de solo lectura al mismo archivo.
+        connection = self.connect(read_only_uri(self.db_path), uri=True)
+        connection.execute(f"PRAGMA busy_timeout = {self.busy_timeout}")
+        return connection
+
+    @contextmanager
+    def reading(self):
+        # Presta una conexión de lectura del grupo; si están todas ocupadas espera a que se libere una.
+        try:
+            connection = self.readers.get_nowait()
+        except queue.Empty:
+            with self.readers_lock:
+                connection = None
+                if len(self.opened_readers) < self.max_readers:
+                    connection = self.open_reader()
+                    self.opened_readers.append(connection)
+            if connection is None:
+                connection = self.readers.get()  # Espera a que otro hilo devuelva una conexión.
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()  # No deja lecturas abiertas que retengan el WAL.
+            self.readers.put(connection)  # Devuelve la conexión al grupo.
+
+    @contextmanager
+    def writing(self):
+        # Presta la conexión de escritura dentro de una transacción; confirma al salir o deshace si hay error.
+        with self.write_lock:
+            with self.writer:
+                yield self.writer
+
+    def change_version(self):
+        # Devuelve PRAGMA data_version de una conexión que nunca escribe: como todas las escrituras
+        # vienen de otras conexiones (la de escritura u otros procesos), cambia con cada commit.
+        # No usa la conexión de escritura, así que no espera a las transacciones en curso.
+        with self.watcher_lock:
+            if self.watcher is None:
+                self.watcher = self.open_reader()
+            return self.watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        # Cierra todas las conexiones.
+        with self.readers_lock:
+            for connection in self.opened_readers:
+                connection.close()
+            self.opened_readers = []
+        with self.watcher_lock:
+            if self.watcher is not None:
+                self.watcher.close()
+                self.watcher = None
+        with self.write_lock:
+            self.writer.close()
@@ -0,0 +1,84 @@
+import re  # Importa el módulo de expresiones regulares para las reglas de validación.
+
+# Reglas de cada campo, compiladas una sola vez: campo -> (patrón que debe cumplir el valor completo, mensaje).
+RULES = {
+    "nombre": (re.compile(r"[A-Za-záéíóúÁÉÍÓÚñÑ\s]+"), "El nombre solo debe contener letras y espacios."),
+    "edad": (re.compile(r"[0-9]{1,2}"), "La edad no es válida."),
+    "correo": (re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+"), "El correo no es válido."),
+    "telefono": (re.compile(r"[0-9]{1,10}"), "El teléfono no es válido."),
+    "ci": (re.compile(r"[0-9]{1,13}"), "La cédula no es válida."),
+}
+MISSING = "Falta rellenar campos."  # Mensaje si falta algún campo.
+FIELDS = ("nombre", "edad", "correo", "telefono")  # Campos de un contacto, en el orden de ContactManager.
+BATCH_MIN_ROWS = 1000  # Por debajo de este tamaño validar fila a fila es más rápido que armar un DataFrame.
+
+# Función que convierte un valor leído (texto, número o vacío) en el texto que se valida.
+def clean(value):
+    if value is None or value != value:  # Vacío o NaN.
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # Excel guarda los números como float.
+    return str(value).strip()
+
+# Función que valida un contacto (el del formulario o una fila suelta) y devuelve
+# (contacto, None) o (None, mensaje del primer error). El contacto tiene la edad como entero.
+# La cédula solo se valida si se pasa (ci=None: el formulario no la tiene).
+def validate_contact(name, age, email, phone, ci=None):
+    values = [clean(value) for value in (name, age, email, phone)]
+    fields = FIELDS
+    if ci is not None:
+        values.append(clean(ci))
+        fields = FIELDS + ("ci",)
+    if not all(values):
+        return None, MISSING
+    for field, value in zip(fields, values):
+        pattern, message = RULES[field]
+        if not pattern.fullmatch(value):
+            return None, message
+    values[1] = int(values[1])
+    return tuple(values), None
+
+# Función que valida muchas filas de una vez. 'rows' es una lista de tuplas con los campos de 'fields'
+# (FIELDS, o FIELDS + ("ci",)), en ese orden.
+# Devuelve (contactos válidos, errores) con los errores como (posición en 'rows', mensaje).
+# Con pandas, cada regla se aplica a la columna entera (operaciones de texto vectorizadas)
+# en lugar de fila a fila; sin pandas, o con pocas filas, se valida cada fila con validate_contact.
+def validate_batch(rows, fields=FIELDS):
+    if len(rows) < BATCH_MIN_ROWS:
+        return validate_rows(rows, fields)
+    try:
+        import pandas as pd  # Se importa solo cuando se necesita.
+    except ImportError:
+        return validate_rows(rows, fields)
+    frame = pd.DataFrame.from_records(rows, columns=list(fields))
+    errors = pd.Series(None, index=frame.index, dtype="object")  # Primer error de cada fila.
+    for field in fields:
+        column = frame[field]
+        if pd.api.types.infer_dtype(column, skipna=True) == "string":
+            frame[field] = column.fillna("").str.strip()  # Solo texto (CSV): se limpia toda la columna de una vez.
+        else:
+            frame[field] = column.map(clean)  # Números (Excel, Parquet) o tipos mezclados.
+    missing = (frame == "").any(axis=1)
+    errors[missing] = MISSING
+    for field in fields:
+        pattern, message = RULES[field]
+        failed = ~frame[field].str.fullmatch(pattern) & errors.isna()
+        errors[failed] = message
+    valid = frame[errors.isna()]
+    columns = [valid[field].tolist() for field in fields]
+    columns[1] = valid["edad"].astype(int).tolist()
+    failed = errors.dropna()
+    return list(zip(*columns)), list(zip(failed.index.tolist(), failed.tolist()))
+
+# Función que valida fila a fila, con el mismo resultado que validate_batch.
+def validate_rows(rows, fields=FIELDS):
+    valid = []
+    errors = []
+    with_ci = "ci" in fields
+    for position, row in enumerate(rows):
+        contact, error = validate_contact(*row[:4], ci=clean(row[4]) if with_ci else None)
+        if error:
+            errors.append((position, error))
+        else:
+            valid.append(contact)
+    return valid, errors
@@ -0,0 +1,80 @@
+import queue  # Importa queue para la cola de escrituras pendientes.
+import threading  # Importa threading para el hilo escritor.
+import time  # Importa time para la ventana de agrupación.
+from concurrent.futures import Future  # Importa Future para entregar el resultado de cada escritura.
+
+# Clase con un único hilo escritor que agrupa varias escrituras en un mismo commit.
+# Cada escritura es una función operation(connection, *args); su Future se resuelve
+# cuando el commit del grupo terminó, es decir, cuando el cambio ya está en disco.
+class GroupCommitWriter:
+    def __init__(self, connection, lock, max_batch=256, max_delay=0.005):
+        self.connection = connection  # Conexión de escritura; solo la usa el hilo escritor.
+        self.lock = lock  # Bloqueo de la conexión de escritura, tomado durante cada grupo.
+        self.max_batch = max_batch  # Máximo de escrituras por commit.
+        self.max_delay = max_delay  # Segundos que se espera a más escrituras antes de confirmar.
+        self.queue = queue.Queue()  # Escrituras pendientes.
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, operation, *args):
+        # Método para encolar una escritura; devuelve un Future con su resultado.
+        future = Future()
+        self.queue.put((operation, args, future))
+        return future
+
+    def close(self):
+        # Método para confirmar lo pendiente y detener el hilo escritor.
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self):
+        # Bucle del hilo escritor: junta escrituras y las confirma por grupos.
+        running = True
+        while running:
+            batch = [self.queue.get()]  # Espera la primera escritura del grupo.
+            if batch[0] is None:
+                break
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:  # Junta más escrituras hasta llenar el grupo o agotar la ventana.
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            with self.lock:
+                results = self.commit_batch(batch)
+            # Los Future se resuelven fuera del bloqueo: sus callbacks (p. ej. la caché) pueden
+            # tomar otros bloqueos o leer la base de datos sin esperar a la conexión de escritura.
+            for future, (result, error) in results:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    def commit_batch(self, batch):
+        # Ejecuta el grupo en una sola transacción. Cada escritura va en su propio SAVEPOINT,
+        # así un error solo deshace esa escritura y no las demás del grupo.
+        # Devuelve [(future, (resultado, error))] para resolver después de soltar el bloqueo.
+        results = []
+        try:
+            self.connection.execute("BEGIN")
+            for operation, args, future in batch:
+                self.connection.execute("SAVEPOINT escritura")
+                try:
+                    result = (operation(self.connection, *args), None)
+                    self.connection.execute("RELEASE escritura")
+                except Exception as error:
+                    self.connection.execute("ROLLBACK TO escritura")
+                    self.connection.execute("RELEASE escritura")
+                    result = (None, error)
+                results.append((future, result))
+            self.connection.commit()  # Un único commit (y un único fsync) para todo el grupo.
+        except Exception as error:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            # El commit falló: ninguna escritura es durable.
+            return [(future, (None, error)) for operation, args, future in batch]
+        return results